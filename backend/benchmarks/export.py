@@ -0,0 +1,53 @@
+"""Throughput and memory of the NDJSON journal export.
+
+Usage (from backend/): python -m benchmarks.export [posts] [--gzip]
+Seeds a throwaway user with `posts` entries, streams the export and reports
+rows/s, MB/s and the Python heap peak, which should stay flat as posts grows.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.seed import create_user, drop_user, seed_journal
+from src.db.session import AsyncSessionLocal, async_engine
+from src.schemas.auth import Principal
+from src.services.user_service import UserService
+
+
+async def main(posts: int = 50_000, compress: bool = False) -> dict:
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, prefix="export")
+        await seed_journal(db, user.id, posts)
+        principal = Principal.model_validate(user)
+
+        try:
+            tracemalloc.start()
+            started = time.perf_counter()
+            total_bytes = 0
+            async for chunk in UserService.export_posts(db, principal, compress=compress):
+                total_bytes += len(chunk)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            await drop_user(db, user.id)
+
+    await async_engine.dispose()
+    return {
+        "posts": posts,
+        "gzip": compress,
+        "seconds": elapsed,
+        "rows_per_second": posts / elapsed,
+        "mb_per_second": total_bytes / elapsed / 1e6,
+        "bytes": total_bytes,
+        "peak_heap_mb": peak / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--gzip"]
+    result = asyncio.run(main(*map(int, args), compress="--gzip" in sys.argv))
+    print(json.dumps(result, indent=2))
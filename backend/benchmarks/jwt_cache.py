@@ -0,0 +1,38 @@
+"""Compare cached vs uncached access-token verification.
+
+Usage (from backend/): python -m benchmarks.jwt_cache [iterations]
+"""
+
+import json
+import sys
+import timeit
+
+from src.core.security import (
+    create_access_token,
+    decode_access_token,
+    decode_access_token_cached,
+    verified_token_cache,
+)
+
+
+def main(iterations: int = 20_000) -> dict:
+    token = create_access_token(data={"sub": "00000000-0000-0000-0000-000000000000"})
+    verified_token_cache.clear()
+    decode_access_token_cached(token)
+
+    results = {}
+    for name, fn in (
+        ("uncached", decode_access_token),
+        ("cached", decode_access_token_cached),
+    ):
+        seconds = timeit.timeit(lambda: fn(token), number=iterations)
+        results[name] = {
+            "iterations": iterations,
+            "us_per_call": seconds / iterations * 1e6,
+        }
+    results["speedup"] = results["uncached"]["us_per_call"] / results["cached"]["us_per_call"]
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(*map(int, sys.argv[1:])), indent=2))
@@ -0,0 +1,145 @@
+"""Seed a dataset, drive mixed traffic and write per-endpoint latency as JSON.
+
+Usage (from backend/):
+    python -m benchmarks.load [--users 50 --posts-per-user 200 ...] [--output run.json]
+    python -m benchmarks.load --base-url http://127.0.0.1:8000   # against uvicorn
+
+In-process runs call the ASGI app directly (no network); with --base-url the
+server must use the same DATABASE_URL, since seeding writes to it directly.
+The same --seed seeds the same dataset, so two commits can be compared on it.
+The traffic itself is not replayed exactly: workers share one RNG and
+interleave by timing, so compare the latency figures, not the JSON byte for byte.
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+from contextlib import AsyncExitStack
+from dataclasses import asdict
+
+import httpx
+
+from benchmarks.load.dataset import DatasetConfig, drop_dataset, seed_dataset
+from benchmarks.load.traffic import DEFAULT_MIX, Recorder, Traffic
+from src.db.session import AsyncSessionLocal
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    """Operation weights from `feed=30,post_detail=20`; unknown operations are rejected."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+async def main(args: argparse.Namespace) -> dict:
+    config = DatasetConfig(
+        users=args.users,
+        posts_per_user=args.posts_per_user,
+        categories=args.categories,
+        tags=args.tags,
+        skew=args.skew,
+        public_ratio=args.public_ratio,
+        seed=args.seed,
+    )
+    async with AsyncSessionLocal() as db:
+        dataset = await seed_dataset(db, config)
+
+    try:
+        async with AsyncExitStack() as stack:
+            if args.base_url:
+                transport = None
+                base_url = args.base_url
+            else:
+                from src.main import app, lifespan
+
+                await stack.enter_async_context(lifespan(app))
+                transport = httpx.ASGITransport(app=app)
+                base_url = "http://bench"
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60)
+            )
+
+            recorder = Recorder()
+            traffic = Traffic(
+                client,
+                dataset,
+                recorder,
+                mix=args.mix or DEFAULT_MIX,
+                page_size=args.page_size,
+                seed=args.seed,
+            )
+            await traffic.open_sessions(args.sessions)
+            elapsed = await traffic.run(
+                concurrency=args.concurrency, duration=args.duration, warmup=args.warmup
+            )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await drop_dataset(db, dataset)
+
+    return {
+        "revision": _git_revision(),
+        "mode": "http" if args.base_url else "in-process",
+        "dataset": asdict(config),
+        "traffic": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "sessions": args.sessions,
+            "page_size": args.page_size,
+            "mix": args.mix or DEFAULT_MIX,
+        },
+        **recorder.summary(elapsed),
+    }
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    data = parser.add_argument_group("dataset")
+    data.add_argument("--users", type=int, default=defaults.users)
+    data.add_argument("--posts-per-user", type=int, default=defaults.posts_per_user)
+    data.add_argument("--categories", type=int, default=defaults.categories)
+    data.add_argument("--tags", type=int, default=defaults.tags)
+    data.add_argument(
+        "--skew", type=float, default=defaults.skew, help="Zipf exponent, 0 = uniform"
+    )
+    data.add_argument("--public-ratio", type=float, default=defaults.public_ratio)
+    data.add_argument("--seed", type=int, default=defaults.seed)
+    load = parser.add_argument_group("traffic")
+    load.add_argument("--base-url", help="drive a running server instead of the app in-process")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    load.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    load.add_argument("--sessions", type=int, default=20, help="logged-in users to rotate")
+    load.add_argument("--page-size", type=int, default=20)
+    load.add_argument("--mix", type=_parse_mix, help="e.g. feed=30,post_detail=20")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    report = json.dumps(asyncio.run(main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
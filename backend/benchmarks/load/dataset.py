@@ -0,0 +1,129 @@
+"""Seeded users, posts, tags and categories for a load run, written straight to the DB."""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.seed import BENCH_PASSWORD, WORDS, paragraph
+from src.core.const import PostStatus, UserRole
+from src.core.reading import content_stats
+from src.core.security import hash_password
+from src.dao.post_dao import PostDAO
+from src.models.category import Category
+from src.models.user import User
+
+
+@dataclass
+class DatasetConfig:
+    users: int = 50
+    posts_per_user: int = 200
+    categories: int = 20
+    tags: int = 200
+    # Zipf exponent for tag and category popularity; 0 is uniform
+    skew: float = 1.1
+    public_ratio: float = 0.7
+    words_per_post: int = 300
+    seed: int = 0
+
+
+@dataclass
+class Dataset:
+    run_id: str
+    users: list[tuple[str, uuid.UUID]]
+    admin: tuple[str, uuid.UUID]
+    category_ids: list[uuid.UUID]
+    tags: list[str]
+    public_post_ids: list[uuid.UUID]
+    post_ids_by_user: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+
+    @property
+    def password(self) -> str:
+        return BENCH_PASSWORD
+
+
+def zipf_weights(count: int, skew: float) -> list[float]:
+    return [1 / (rank**skew) for rank in range(1, count + 1)]
+
+
+async def seed_dataset(db: AsyncSession, config: DatasetConfig) -> Dataset:
+    rng = random.Random(config.seed)
+    run_id = uuid.uuid4().hex[:8]
+    # One bcrypt hash shared by every seeded account keeps seeding fast
+    hashed_password = hash_password(BENCH_PASSWORD)
+
+    users = [
+        User(
+            username=f"load_{run_id}_{index}",
+            email=f"load_{run_id}_{index}@example.com",
+            hashed_password=hashed_password,
+        )
+        for index in range(config.users)
+    ]
+    admin = User(
+        username=f"load_{run_id}_admin",
+        email=f"load_{run_id}_admin@example.com",
+        hashed_password=hashed_password,
+        role=UserRole.ADMIN,
+    )
+    categories = [
+        Category(name=f"load-{run_id}-{index}") for index in range(config.categories)
+    ]
+    db.add_all([*users, admin, *categories])
+    await db.commit()
+
+    tags = [f"{WORDS[index]}-{index}" for index in range(config.tags)]
+    tag_weights = zipf_weights(len(tags), config.skew)
+    category_weights = zipf_weights(len(categories), config.skew)
+    dataset = Dataset(
+        run_id=run_id,
+        users=[(user.username, user.id) for user in users],
+        admin=(admin.username, admin.id),
+        category_ids=[category.id for category in categories],
+        tags=tags,
+        public_post_ids=[],
+    )
+
+    for user in users:
+        posts, links = [], []
+        for _ in range(config.posts_per_user):
+            post_id = uuid.uuid4()
+            is_public = rng.random() < config.public_ratio
+            content = paragraph(rng, config.words_per_post)
+            posts.append(
+                {
+                    "id": post_id,
+                    "title": paragraph(rng, 6),
+                    "content": content,
+                    **content_stats(content),
+                    "status": PostStatus.PUBLIC if is_public else PostStatus.DRAFT,
+                    "tags": sorted(
+                        set(rng.choices(tags, tag_weights, k=rng.randint(0, 4)))
+                    ),
+                    "author_id": user.id,
+                }
+            )
+            if categories:
+                links.extend(
+                    {"post_id": post_id, "category_id": category_id}
+                    for category_id in set(
+                        rng.choices(
+                            dataset.category_ids, category_weights, k=rng.randint(0, 3)
+                        )
+                    )
+                )
+            if is_public:
+                dataset.public_post_ids.append(post_id)
+        await PostDAO.bulk_create(db, posts, links)
+        dataset.post_ids_by_user[user.id] = [post["id"] for post in posts]
+    return dataset
+
+
+async def drop_dataset(db: AsyncSession, dataset: Dataset) -> None:
+    """Remove everything a run created; posts go with their authors via ON DELETE CASCADE."""
+    user_ids = [user_id for _, user_id in dataset.users] + [dataset.admin[1]]
+    await db.execute(delete(User).where(User.id.in_(user_ids)))
+    await db.execute(delete(Category).where(Category.id.in_(dataset.category_ids)))
+    await db.commit()
@@ -0,0 +1,264 @@
+"""Mixed API traffic against a seeded dataset, with per-endpoint latency stats."""
+
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.load.dataset import Dataset, zipf_weights
+from benchmarks.seed import paragraph
+
+API = "/api/v1"
+
+# Relative weight of each operation in the mix
+DEFAULT_MIX = {
+    "login": 2,
+    "feed": 30,
+    "feed_deep": 10,
+    "feed_by_tag": 8,
+    "post_detail": 25,
+    "create_post": 8,
+    "update_post": 7,
+    "admin_posts": 5,
+    "admin_users": 5,
+}
+# Pages walked by feed_deep, following next_cursor
+FEED_DEPTHS = (2, 5, 10)
+
+
+@dataclass
+class Session:
+    username: str
+    user_id: str
+    headers: dict
+    own_post_ids: list = field(default_factory=list)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.enabled = True
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        if not self.enabled:
+            return
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+        if status >= 400:
+            self.errors[name] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            samples.sort()
+            endpoints[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "statuses": {
+                    str(code): count for code, count in sorted(self.statuses[name].items())
+                },
+                "throughput_rps": len(samples) / elapsed,
+                "mean_ms": sum(samples) / len(samples) * 1000,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "elapsed_seconds": elapsed,
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+
+class Traffic:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        dataset: Dataset,
+        recorder: Recorder,
+        *,
+        mix: dict[str, int] = DEFAULT_MIX,
+        page_size: int = 20,
+        seed: int = 0,
+    ):
+        self.client = client
+        self.dataset = dataset
+        self.recorder = recorder
+        self.mix = mix
+        self.page_size = page_size
+        self.rng = random.Random(seed)
+        self.sessions: list[Session] = []
+        self.admin: Session | None = None
+        self.tag_weights = zipf_weights(len(dataset.tags), 1.0)
+
+    async def _call(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, API + url, **kwargs)
+        self.recorder.record(name, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def _login(self, username: str, user_id) -> Session:
+        response = await self._call(
+            "POST /auth/login",
+            "POST",
+            "/auth/login",
+            data={"username": username, "password": self.dataset.password},
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        return Session(
+            username=username,
+            user_id=str(user_id),
+            headers={"Authorization": f"Bearer {token}"},
+            own_post_ids=list(self.dataset.post_ids_by_user.get(user_id, [])),
+        )
+
+    async def open_sessions(self, count: int) -> None:
+        """Log in `count` seeded users and the admin; not part of the measured window."""
+        users = self.rng.sample(self.dataset.users, min(count, len(self.dataset.users)))
+        self.recorder.enabled = False
+        self.sessions = [await self._login(username, uid) for username, uid in users]
+        self.admin = await self._login(*self.dataset.admin)
+        self.recorder.enabled = True
+
+    # --- Operations ---
+
+    async def login(self, session: Session) -> None:
+        fresh = await self._login(session.username, session.user_id)
+        session.headers = fresh.headers
+
+    async def feed(self, session: Session) -> None:
+        await self._call(
+            "GET /posts",
+            "GET",
+            "/posts",
+            params={"page_size": self.page_size},
+            headers=session.headers,
+        )
+
+    async def feed_deep(self, session: Session) -> None:
+        depth = self.rng.choice(FEED_DEPTHS)
+        params = {"page_size": self.page_size, "include_total": "false"}
+        for page in range(1, depth + 1):
+            name = f"GET /posts?cursor depth={depth}" if page == depth else "GET /posts?cursor"
+            response = await self._call(
+                name,
+                "GET",
+                "/posts",
+                params=params,
+                headers=session.headers,
+            )
+            if not response.is_success or not response.json().get("next_cursor"):
+                return
+            params["cursor"] = response.json()["next_cursor"]
+
+    async def feed_by_tag(self, session: Session) -> None:
+        await self._call(
+            "GET /posts?tag",
+            "GET",
+            "/posts",
+            params={
+                "page_size": self.page_size,
+                "tag": self.rng.choices(self.dataset.tags, self.tag_weights)[0],
+            },
+            headers=session.headers,
+        )
+
+    async def post_detail(self, session: Session) -> None:
+        pool = self.dataset.public_post_ids or session.own_post_ids
+        if not pool:
+            return
+        await self._call(
+            "GET /posts/{id}",
+            "GET",
+            f"/posts/{self.rng.choice(pool)}",
+            headers=session.headers,
+        )
+
+    async def create_post(self, session: Session) -> None:
+        category_ids = self.dataset.category_ids
+        categories = self.rng.sample(
+            category_ids, min(len(category_ids), self.rng.randint(0, 2))
+        )
+        response = await self._call(
+            "POST /posts",
+            "POST",
+            "/posts",
+            json={
+                "title": paragraph(self.rng, 6),
+                "content": paragraph(self.rng, 200),
+                "status": self.rng.choice(["public", "draft"]),
+                "tags": self.rng.sample(self.dataset.tags[:20], k=2),
+                "category_ids": [str(cid) for cid in categories],
+            },
+            headers=session.headers,
+        )
+        if response.is_success:
+            session.own_post_ids.append(response.json()["id"])
+
+    async def update_post(self, session: Session) -> None:
+        if not session.own_post_ids:
+            return
+        await self._call(
+            "PUT /posts/{id}",
+            "PUT",
+            f"/posts/{self.rng.choice(session.own_post_ids)}",
+            json={
+                "title": paragraph(self.rng, 5),
+                "tags": self.rng.sample(self.dataset.tags[:20], k=3),
+            },
+            headers=session.headers,
+        )
+
+    async def admin_posts(self, session: Session) -> None:
+        await self._call(
+            "GET /admin/posts",
+            "GET",
+            "/admin/posts",
+            params={"page_size": self.page_size},
+            headers=self.admin.headers,
+        )
+
+    async def admin_users(self, session: Session) -> None:
+        await self._call(
+            "GET /admin/users", "GET", "/admin/users", headers=self.admin.headers
+        )
+
+    # --- Driver ---
+
+    async def _worker(self, deadline: float) -> None:
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            operation = getattr(self, self.rng.choices(names, weights)[0])
+            await operation(self.rng.choice(self.sessions))
+
+    async def run(self, *, concurrency: int, duration: float, warmup: float = 0.0) -> float:
+        """Drive the mix with `concurrency` workers; returns the measured seconds."""
+        if warmup:
+            self.recorder.enabled = False
+            await asyncio.gather(
+                *(self._worker(time.perf_counter() + warmup) for _ in range(concurrency))
+            )
+            self.recorder.enabled = True
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(self._worker(started + duration) for _ in range(concurrency))
+        )
+        return time.perf_counter() - started
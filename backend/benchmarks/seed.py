@@ -0,0 +1,71 @@
+"""Seed helpers shared by the benchmarks. They write to settings.DATABASE_URL."""
+
+import random
+import string
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.reading import content_stats
+from src.core.security import hash_password
+from src.dao.post_dao import PostDAO
+from src.dao.user_dao import UserDAO
+from src.models.user import User
+
+BENCH_PASSWORD = "Bench-password-1"
+WORDS = [
+    "".join(random.Random(i).choices(string.ascii_lowercase, k=random.Random(i).randint(3, 9)))
+    for i in range(2000)
+]
+
+
+def paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def create_user(db: AsyncSession, prefix: str = "bench"):
+    suffix = uuid.uuid4().hex[:10]
+    return await UserDAO.create(
+        db,
+        username=f"{prefix}_{suffix}",
+        email=f"{prefix}_{suffix}@example.com",
+        hashed_password=hash_password(BENCH_PASSWORD),
+    )
+
+
+async def seed_journal(
+    db: AsyncSession,
+    author_id: uuid.UUID,
+    posts: int,
+    *,
+    words_per_post: int = 400,
+    batch_size: int = 1000,
+    seed: int = 0,
+) -> None:
+    rng = random.Random(seed)
+    batch = []
+    for _ in range(posts):
+        content = paragraph(rng, words_per_post)
+        batch.append(
+            {
+                "id": uuid.uuid4(),
+                "title": paragraph(rng, 6),
+                "content": content,
+                **content_stats(content),
+                "status": rng.choice(["public", "draft"]),
+                "tags": rng.sample(WORDS[:50], k=rng.randint(0, 4)),
+                "author_id": author_id,
+            }
+        )
+        if len(batch) >= batch_size:
+            await PostDAO.bulk_create(db, batch, [])
+            batch = []
+    if batch:
+        await PostDAO.bulk_create(db, batch, [])
+
+
+async def drop_user(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Delete a seeded user; posts go with it through ON DELETE CASCADE."""
+    await db.execute(delete(User).where(User.id == user_id))
+    await db.commit()
@@ -0,0 +1,103 @@
+"""Post list serialization: the response_model path vs the single-pass path.
+
+Usage (from backend/): python -m benchmarks.serialization [requests] [page_size]
+No database needed: in-memory posts are served by a throwaway app through
+httpx.ASGITransport, so the numbers cover routing, validation and encoding only.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.seed import paragraph
+from src.core.const import CountMode
+from src.core.http import model_response
+from src.schemas.post import PostListResponse, post_list_adapter
+
+
+def fake_posts(count: int, seed: int = 0) -> list[SimpleNamespace]:
+    """Objects shaped like ORM posts with their author and categories loaded."""
+    rng = random.Random(seed)
+    author = SimpleNamespace(id=uuid.uuid4(), username="bench", fullname="Bench Writer")
+    categories = [SimpleNamespace(id=uuid.uuid4(), name=f"category-{i}") for i in range(5)]
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            title=paragraph(rng, 6),
+            content=paragraph(rng, 300),
+            created_at=now,
+            updated_at=now,
+            status="public",
+            tags=rng.sample(["daily", "gratitude", "work", "travel", "health"], k=2),
+            author_id=author.id,
+            author=author,
+            categories=rng.sample(categories, k=2),
+        )
+        for _ in range(count)
+    ]
+
+
+def build_app(posts: list) -> FastAPI:
+    app = FastAPI()
+    page = {"total": len(posts), "total_kind": CountMode.EXACT, "page": 1}
+
+    @app.get(
+        "/response-model",
+        response_model=PostListResponse,
+        response_model_exclude_unset=True,
+    )
+    async def response_model_path():
+        return PostListResponse(items=posts, page_size=len(posts), **page)
+
+    @app.get("/single-pass", response_model=PostListResponse)
+    async def single_pass_path():
+        items = post_list_adapter.validate_python(posts, from_attributes=True)
+        return model_response(
+            PostListResponse.model_construct(items=items, page_size=len(posts), **page),
+            exclude_unset=True,
+        )
+
+    return app
+
+
+async def main(requests: int = 2000, page_size: int = 100) -> dict:
+    app = build_app(fake_posts(page_size))
+    results = {}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        bodies = {}
+        for path in ("/response-model", "/single-pass"):
+            for _ in range(requests // 10):  # warm up
+                await client.get(path)
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get(path)
+            elapsed = time.perf_counter() - started
+            bodies[path] = response.json()
+            results[path] = {
+                "requests": requests,
+                "page_size": page_size,
+                "requests_per_second": requests / elapsed,
+                "ms_per_request": elapsed / requests * 1000,
+                "bytes": len(response.content),
+            }
+    # The fast path must not change what clients receive
+    assert all(body == bodies["/response-model"] for body in bodies.values())
+    baseline = results["/response-model"]["ms_per_request"]
+    for result in results.values():
+        result["speedup"] = baseline / result["ms_per_request"]
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(*map(int, sys.argv[1:]))), indent=2))
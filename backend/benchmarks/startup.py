@@ -0,0 +1,64 @@
+"""Cold-start cost of a worker: importing the app and running its lifespan.
+
+Usage (from backend/): python -m benchmarks.startup [runs]
+Each run is a fresh interpreter, so import time includes module loading.
+`create_all_ms` times the DDL introspection the lifespan used to do, for comparison.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+from src.main import app, lifespan
+imported = time.perf_counter()
+
+async def boot():
+    async with lifespan(app):
+        booted = time.perf_counter()
+    return booted
+
+booted = asyncio.run(boot())
+
+from src.db.base_class import Base
+from src.db.session import engine
+create_all_started = time.perf_counter()
+Base.metadata.create_all(engine)
+create_all = time.perf_counter() - create_all_started
+engine.dispose()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": (booted - imported) * 1000,
+    "create_all_ms": create_all * 1000,
+}))
+"""
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def main(runs: int = 10) -> dict:
+    samples = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", PROBE], capture_output=True, check=True, text=True
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return {
+        "runs": runs,
+        **{key: _summary([sample[key] for sample in samples]) for key in samples[0]},
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(*map(int, sys.argv[1:])), indent=2))
@@ -1,9 +1,16 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-
-from src.core.dependencies import get_db, get_current_admin
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.admission import admission_gates
+from src.core.const import PostView
+from src.core.dependencies import get_db, get_current_admin, principal_cache
+from src.core.http import json_response_with_etag, model_response
+from src.core.security import password_hash_pool, verified_token_cache
+from src.core.query_budget import query_budget
+from src.db.pool import pool_stats
+from src.db.session import async_engine, replica_engines
 from src.schemas.user import UserResponse, AdminUserUpdate
 from src.schemas.post import PostResponse, PostListResponse, AdminPostUpdate
 from src.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
@@ -17,91 +24,159 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 # --- User management ---
 
 
-@router.get("/users", response_model=list[UserResponse])
-def list_users(
+@router.get("/users", response_model=list[UserResponse], dependencies=[query_budget(2)])
+async def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return UserService.admin_get_all_users(db, skip=skip, limit=limit)
+    return await UserService.admin_get_all_users(db, skip=skip, limit=limit)
 
 
-@router.patch("/users/{user_id}/status", response_model=UserResponse)
-def update_user_status(
+@router.patch(
+    "/users/{user_id}/status",
+    response_model=UserResponse,
+    dependencies=[query_budget(2)],
+)
+async def update_user_status(
     user_id: UUID,
     payload: AdminUserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return UserService.admin_update_user_status(db, user_id, payload)
+    return await UserService.admin_update_user_status(db, user_id, payload)
 
 
 # --- Post management ---
 
 
-@router.get("/posts", response_model=PostListResponse)
-def list_all_posts(
+@router.get(
+    "/posts",
+    response_model=PostListResponse,
+    dependencies=[query_budget(3)],
+)
+async def list_all_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     status: str | None = Query(None),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
+    view: PostView = Query(PostView.FULL),
+    fields: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    posts, total = PostService.admin_list_all_posts(
-        db, page=page, page_size=page_size, status_filter=status
+    result = await PostService.admin_list_all_posts(
+        db,
+        page=page,
+        page_size=page_size,
+        status_filter=status,
+        cursor=cursor,
+        include_total=include_total,
+        view=view,
+        fields=fields,
+    )
+    return model_response(
+        PostListResponse.model_construct(**result, page=page, page_size=page_size),
+        exclude_unset=True,
     )
-    return PostListResponse(items=posts, total=total, page=page, page_size=page_size)
 
 
-@router.patch("/posts/{post_id}/status", response_model=PostResponse)
-def update_post_status(
+@router.patch(
+    "/posts/{post_id}/status",
+    response_model=PostResponse,
+    dependencies=[query_budget(2)],
+)
+async def update_post_status(
     post_id: UUID,
     payload: AdminPostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return PostService.admin_update_post_status(db, post_id, payload)
+    return await PostService.admin_update_post_status(db, post_id, payload)
 
 
 # --- Category management ---
 
 
-@router.get("/categories", response_model=list[CategoryResponse])
-def list_categories(
-    db: Session = Depends(get_db),
+@router.get(
+    "/categories", response_model=list[CategoryResponse], dependencies=[query_budget(2)]
+)
+async def list_categories(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return CategoryService.list_categories(db)
+    body, etag = await CategoryService.list_categories_cached(db)
+    return json_response_with_etag(request, body, etag)
 
 
-@router.post("/categories", response_model=CategoryResponse, status_code=201)
-def create_category(
+@router.post(
+    "/categories",
+    response_model=CategoryResponse,
+    status_code=201,
+    dependencies=[query_budget(2)],
+)
+async def create_category(
     payload: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return CategoryService.create_category(db, payload)
+    return await CategoryService.create_category(db, payload)
 
 
-@router.put("/categories/{category_id}")
-def update_category(
+@router.put("/categories/{category_id}", dependencies=[query_budget(2)])
+async def update_category(
     category_id: UUID,
     payload: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    result = CategoryService.update_category(db, category_id, payload)
+    result = await CategoryService.update_category(db, category_id, payload)
     return {
         "category": CategoryResponse.model_validate(result["category"]),
         "warning": result["warning"],
     }
 
 
-@router.delete("/categories/{category_id}", status_code=204)
-def delete_category(
+@router.delete(
+    "/categories/{category_id}", status_code=204, dependencies=[query_budget(5)]
+)
+async def delete_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    CategoryService.delete_category(db, category_id)
+    await CategoryService.delete_category(db, category_id)
+
+
+# --- Runtime stats ---
+
+
+@router.get("/stats/password-hashing", dependencies=[query_budget(1)])
+async def password_hashing_stats(_admin=Depends(get_current_admin)):
+    return password_hash_pool.stats()
+
+
+@router.get("/stats/principal-cache", dependencies=[query_budget(1)])
+async def principal_cache_stats(_admin=Depends(get_current_admin)):
+    return principal_cache.stats()
+
+
+@router.get("/stats/token-cache", dependencies=[query_budget(1)])
+async def token_cache_stats(_admin=Depends(get_current_admin)):
+    return verified_token_cache.stats()
+
+
+@router.get("/stats/db-pool", dependencies=[query_budget(1)])
+async def db_pool_stats(_admin=Depends(get_current_admin)):
+    return {
+        **pool_stats(async_engine.pool),
+        "replicas": [pool_stats(engine.pool) for engine in replica_engines],
+    }
+
+
+@router.get("/stats/admission", dependencies=[query_budget(1)])
+async def admission_stats(_admin=Depends(get_current_admin)):
+    return {route_class: gate.stats() for route_class, gate in admission_gates.items()}
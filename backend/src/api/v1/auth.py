@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.dependencies import get_db
+from src.core.query_budget import query_budget
 from src.schemas.auth import Token
 from src.schemas.user import UserCreate, UserResponse
 from src.services.auth_service import AuthService
@@ -10,15 +11,20 @@ from src.services.auth_service import AuthService
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=201)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    user = AuthService.register(db, payload)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=201,
+    dependencies=[query_budget(1)],
+)
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
+    user = await AuthService.register(db, payload)
     return user
 
 
-@router.post("/login", response_model=Token)
-def login(
+@router.post("/login", response_model=Token, dependencies=[query_budget(1)])
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    return AuthService.login(db, form_data.username, form_data.password)
+    return await AuthService.login(db, form_data.username, form_data.password)
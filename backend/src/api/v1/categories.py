@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.dependencies import get_db
+from src.core.http import json_response_with_etag
+from src.core.query_budget import query_budget
 from src.schemas.category import CategoryResponse
 from src.services.category_service import CategoryService
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
-@router.get("", response_model=list[CategoryResponse])
-def list_categories(db: Session = Depends(get_db)):
-    return CategoryService.list_categories(db)
+@router.get("", response_model=list[CategoryResponse], dependencies=[query_budget(1)])
+async def list_categories(request: Request, db: AsyncSession = Depends(get_db)):
+    body, etag = await CategoryService.list_categories_cached(db)
+    return json_response_with_etag(request, body, etag)
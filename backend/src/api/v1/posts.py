@@ -1,32 +1,51 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
+from src.core.const import PostView
 from src.core.dependencies import get_db, get_current_user
-from src.models.user import User
+from src.core.http import http_date, is_not_modified, model_response
+from src.core.streaming import NDJSON_MEDIA_TYPES, iter_json_array, iter_ndjson
+from src.core.query_budget import query_budget
+from src.schemas.auth import Principal
 from src.schemas.post import (
     PostCreate,
     PostUpdate,
     PostResponse,
+    PostImportResponse,
     PostListResponse,
+    PostSearchResponse,
 )
 from src.services.post_service import PostService
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
-@router.get("", response_model=PostListResponse)
-def list_posts(
+@router.get(
+    "",
+    response_model=PostListResponse,
+    dependencies=[query_budget(3)],
+)
+async def list_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     status: str | None = Query(None, description="Filter by status: public, draft"),
     tag: str | None = Query(None, description="Filter by tag"),
     author_id: UUID | None = Query(None, description="Filter by author"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = Query(
+        None, description="Opaque next_cursor from a previous page; overrides page"
+    ),
+    include_total: bool = Query(True, description="Set false to skip counting"),
+    view: PostView = Query(PostView.FULL, description="summary omits content"),
+    fields: str | None = Query(
+        None, description="Comma-separated post fields to return, e.g. id,title,tags"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    posts, total = PostService.list_posts(
+    result = await PostService.list_posts(
         db,
         current_user,
         page=page,
@@ -34,42 +53,120 @@ def list_posts(
         status_filter=status,
         tag=tag,
         author_id=author_id,
+        cursor=cursor,
+        include_total=include_total,
+        view=view,
+        fields=fields,
+    )
+    return model_response(
+        PostListResponse.model_construct(**result, page=page, page_size=page_size),
+        exclude_unset=True,
     )
-    return PostListResponse(items=posts, total=total, page=page, page_size=page_size)
 
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(
+@router.get(
+    "/search",
+    response_model=PostSearchResponse,
+    dependencies=[query_budget(2)],
+)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    page_size: int = Query(10, ge=1, le=100),
+    status: str | None = Query(None, description="Filter by status: public, draft"),
+    tag: str | None = Query(None, description="Filter by tag"),
+    author_id: UUID | None = Query(None, description="Filter by author"),
+    cursor: str | None = Query(
+        None, description="Opaque next_cursor from a previous page"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    result = await PostService.search_posts(
+        db,
+        current_user,
+        q,
+        page_size=page_size,
+        status_filter=status,
+        tag=tag,
+        author_id=author_id,
+        cursor=cursor,
+    )
+    return model_response(PostSearchResponse.model_construct(**result), exclude_unset=True)
+
+
+@router.get("/{post_id}", response_model=PostResponse, dependencies=[query_budget(3)])
+async def get_post(
     post_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return PostService.get_post(db, post_id, current_user)
+    etag, last_modified, is_public = await PostService.get_post_validators(
+        db, post_id, current_user
+    )
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": (
+            f"public, max-age={settings.PUBLIC_POST_MAX_AGE_SECONDS}"
+            if is_public
+            else "private, no-cache"
+        ),
+    }
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    response.headers.update(headers)
+    return await PostService.get_post(db, post_id, current_user)
 
-@router.post("", response_model=PostResponse, status_code=201)
-def create_post(
+
+@router.post(
+    "", response_model=PostResponse, status_code=201, dependencies=[query_budget(3)]
+)
+async def create_post(
     payload: PostCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return PostService.create_post(db, current_user, payload)
+    return await PostService.create_post(db, current_user, payload)
+
+
+# Unbounded: at most 3 statements per batch of `batch_size` records, plus auth
+@router.post(
+    "/import", response_model=PostImportResponse, dependencies=[query_budget(None)]
+)
+async def import_posts(
+    request: Request,
+    batch_size: int | None = Query(None, ge=1, le=5000, description="Rows per INSERT"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Bulk-create posts from an NDJSON or JSON-array body of PostCreate records."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    parse = iter_ndjson if content_type in NDJSON_MEDIA_TYPES else iter_json_array
+    return await PostService.import_posts(
+        db,
+        current_user,
+        parse(request.stream(), settings.IMPORT_MAX_RECORD_CHARS),
+        batch_size=batch_size or settings.IMPORT_BATCH_SIZE,
+    )
 
 
-@router.put("/{post_id}", response_model=PostResponse)
-def update_post(
+@router.put("/{post_id}", response_model=PostResponse, dependencies=[query_budget(4)])
+async def update_post(
     post_id: UUID,
     payload: PostUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return PostService.update_post(db, post_id, current_user, payload)
+    return await PostService.update_post(db, post_id, current_user, payload)
 
 
-@router.delete("/{post_id}", status_code=204)
-def delete_post(
+@router.delete("/{post_id}", status_code=204, dependencies=[query_budget(4)])
+async def delete_post(
     post_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    PostService.delete_post(db, post_id, current_user)
+    await PostService.delete_post(db, post_id, current_user)
@@ -0,0 +1,25 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dependencies import get_db, get_current_user
+from src.core.query_budget import query_budget
+from src.schemas.auth import Principal
+from src.schemas.tag import TagFacetResponse
+from src.services.tag_service import MAX_FACET_SIZE, TagService
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("", response_model=TagFacetResponse, dependencies=[query_budget(2)])
+async def list_tags(
+    author_id: UUID | None = Query(None, description="Only count this author's posts"),
+    limit: int = Query(50, ge=1, le=MAX_FACET_SIZE),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    items = await TagService.list_tag_counts(
+        db, current_user, author_id=author_id, limit=limit
+    )
+    return TagFacetResponse(items=items)
@@ -1,23 +1,44 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.dependencies import get_db, get_current_user
-from src.models.user import User
+from src.core.query_budget import query_budget
+from src.schemas.auth import Principal
 from src.schemas.user import UserResponse, UserUpdate
 from src.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+@router.get("/me", response_model=UserResponse, dependencies=[query_budget(2)])
+async def get_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await UserService.get_current_user_profile(db, current_user)
 
 
-@router.put("/me", response_model=UserResponse)
-def update_me(
+@router.put("/me", response_model=UserResponse, dependencies=[query_budget(2)])
+async def update_me(
     payload: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await UserService.update_profile(db, current_user, payload)
+
+
+@router.get(
+    "/me/export", response_class=StreamingResponse, dependencies=[query_budget(2)]
+)
+async def export_me(
+    gzip: bool = Query(False, description="Gzip the NDJSON stream"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return UserService.update_profile(db, current_user, payload)
+    filename = "journal.ndjson.gz" if gzip else "journal.ndjson"
+    return StreamingResponse(
+        UserService.export_posts(db, current_user, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
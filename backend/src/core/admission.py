@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+from src.core.config import settings
+from src.core.const import RouteClass
+from src.core.http import json_response
+from src.db.pool import InstrumentedAsyncQueuePool, pool_saturated
+
+API_PREFIX = "/api/v1"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def classify(method: str, path: str) -> RouteClass | None:
+    """Route class of a request; None for paths outside the API (health, metrics, docs)."""
+    if not path.startswith(API_PREFIX + "/"):
+        return None
+    path = path[len(API_PREFIX) :]
+    if path.startswith("/auth/"):
+        return RouteClass.AUTH
+    if path.startswith("/admin/"):
+        return RouteClass.ADMIN
+    return RouteClass.READ if method in READ_METHODS else RouteClass.WRITE
+
+
+class AdmissionGate:
+    """Caps concurrent requests of one route class.
+
+    A request that finds every slot taken queues for at most `queue_timeout`
+    seconds, and is turned away at once if `max_queue` requests already wait.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.rejected_pool = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(limit)
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting up to the deadline; False if the request must be shed."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self._admitted(0.0)
+            return True
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected_queue_full += 1
+                return False
+            self.queued += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.rejected_timeout += 1
+            return False
+        finally:
+            with self._lock:
+                self.queued -= 1
+        self._admitted(time.perf_counter() - started)
+        return True
+
+    def _admitted(self, waited: float) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    def shed_for_pool(self) -> None:
+        with self._lock:
+            self.rejected_pool += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "rejected_pool": self.rejected_pool,
+                "avg_queue_wait_ms": (
+                    self.total_wait_seconds / self.admitted * 1000 if self.admitted else 0.0
+                ),
+                "max_queue_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+
+admission_gates = {
+    route_class: AdmissionGate(
+        limit,
+        settings.ADMISSION_MAX_QUEUE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    )
+    for route_class, limit in settings.ADMISSION_LIMITS.items()
+}
+
+
+class AdmissionMiddleware:
+    """Sheds API requests with a fast 503 + Retry-After instead of letting them pile up.
+
+    A request is rejected before any work when the connection pool it would
+    use is saturated, or when its route class has no free slot within the
+    queue deadline. The slot is held until the response's last chunk is sent.
+    """
+
+    def __init__(
+        self,
+        app,
+        primary_pool: InstrumentedAsyncQueuePool,
+        replica_pools: list[InstrumentedAsyncQueuePool] | None = None,
+        gates: dict[RouteClass, AdmissionGate] = admission_gates,
+    ):
+        self.app = app
+        self.primary_pool = primary_pool
+        self.replica_pools = replica_pools or []
+        self.gates = gates
+
+    def _pool_saturated(self, method: str) -> bool:
+        # Reads are spread over the replicas when there are any, so they are only
+        # shed once every replica is saturated
+        pools = [self.primary_pool]
+        if method in READ_METHODS and self.replica_pools:
+            pools = self.replica_pools
+        return all(
+            pool_saturated(pool, settings.ADMISSION_POOL_MAX_WAITING) for pool in pools
+        )
+
+    async def _reject(self, scope, receive, send) -> None:
+        response = json_response(
+            {"detail": "Server is busy, please retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        route_class = (
+            classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        )
+        gate = self.gates.get(route_class)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self._pool_saturated(scope["method"]):
+            gate.shed_for_pool()
+            await self._reject(scope, receive, send)
+            return
+        if not await gate.acquire():
+            await self._reject(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    clear() bumps `generation`. A reader that passes the generation it saw
+    before loading to set() cannot store a value loaded before the clear.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class VersionedCache:
+    """A single cached value tagged with a version counter.
+
+    Writers call bump() to invalidate. A reader that loaded data under an older
+    version cannot store it, so a read racing a write never caches stale data.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entry: tuple[int, float, Any] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        with self._lock:
+            entry = self._entry
+            if entry and entry[0] == self.version and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def set(self, value: Any, version: int) -> None:
+        with self._lock:
+            if version == self.version:
+                self._entry = (version, time.monotonic() + self.ttl, value)
+
+    def bump(self) -> int:
+        with self._lock:
+            self.version += 1
+            self._entry = None
+            return self.version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -15,3 +15,22 @@ class PostStatus(StrEnum):
     PUBLIC = "public"
     DRAFT = "draft"
     BANNED = "banned"
+
+
+class RouteClass(StrEnum):
+    AUTH = "auth"
+    READ = "read"
+    WRITE = "write"
+    ADMIN = "admin"
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class PostView(StrEnum):
+    FULL = "full"
+    SUMMARY = "summary"
@@ -1,49 +1,66 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import TTLCache
+from src.core.config import settings
 from src.core.const import AccountStatus, UserRole
-from src.core.security import decode_access_token
-from src.db.session import get_db_session
+from src.core.security import decode_access_token_cached
+from src.db.session import attach_user, get_async_db_session
 from src.dao.user_dao import UserDAO
+from src.schemas.auth import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# user id -> Principal; invalidated by UserService on profile/status changes
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
 
-def get_db():
-    yield from get_db_session()
 
+async def get_db(request: Request):
+    # GET requests may read from a replica; anything they write still goes to the primary
+    async for db in get_async_db_session(read_only=request.method in ("GET", "HEAD")):
+        yield db
 
-def get_current_user(
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = decode_access_token(token)
+        payload = decode_access_token_cached(token)
         user_id: str | None = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    attach_user(db, user_id)
 
-    user = UserDAO.get_by_id(db, user_id)
-    if user is None:
-        raise credentials_exception
-    if user.account_status == AccountStatus.BANNED:
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await UserDAO.get_by_id(db, user_id, primary=True)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.model_validate(user)
+        principal_cache.set(user_id, principal)
+
+    if principal.account_status == AccountStatus.BANNED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account has been banned",
         )
-    return user
+    return principal
 
 
-def get_current_admin(current_user=Depends(get_current_user)):
+async def get_current_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import orjson
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def json_response_with_etag(
+    request: Request, body: bytes, etag: str, headers: dict | None = None
+) -> Response:
+    """Serve a pre-serialized JSON body, or 304 if the client already has it."""
+    headers = {"ETag": etag, **(headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def json_response(
+    content, *, status_code: int = 200, headers: dict | None = None
+) -> Response:
+    """Encode plain data (dicts, lists) with orjson, for responses built outside a route."""
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def model_response(
+    model: BaseModel, *, exclude_unset: bool = False, headers: dict | None = None
+) -> Response:
+    """Serialize an already-built response model in one pass (pydantic-core, no re-validation).
+
+    Returning a Response makes FastAPI skip response_model validation and
+    jsonable_encoder; the route's response_model still documents the schema.
+    """
+    return Response(
+        content=model.model_dump_json(exclude_unset=exclude_unset),
+        media_type="application/json",
+        headers=headers,
+    )
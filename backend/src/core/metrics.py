@@ -0,0 +1,186 @@
+"""Per-route request metrics in Prometheus text format.
+
+MetricsMiddleware times every request and records the SQL it ran (statement
+count, DB time, time waiting for a pooled connection). The gap between request
+latency and DB + pool time is what the app itself spent, serialization included.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """SQL work done on behalf of one request; `budget` is set by query_budget()."""
+
+    __slots__ = ("queries", "db_seconds", "pool_wait_seconds", "budget")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.budget: int | None = None
+
+
+# Set by MetricsMiddleware. Engine events mutate the object rather than the
+# variable, so work done in copied contexts still lands on the request.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+def _labels(**values) -> str:
+    escaped = {
+        key: str(value).replace("\\", "\\\\").replace('"', '\\"')
+        for key, value in values.items()
+    }
+    return ",".join(f'{key}="{value}"' for key, value in escaped.items())
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        self.queries: dict[tuple[str, str], int] = {}
+        self.pool_wait: dict[tuple[str, str], float] = {}
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self.responses[(method, route, status)] = (
+                self.responses.get((method, route, status), 0) + 1
+            )
+            self.latency.setdefault(key, Histogram()).observe(seconds)
+            self.db_time.setdefault(key, Histogram()).observe(stats.db_seconds)
+            self.queries[key] = self.queries.get(key, 0) + stats.queries
+            self.pool_wait[key] = self.pool_wait.get(key, 0.0) + stats.pool_wait_seconds
+
+    def render(self, gauges: dict[str, dict] | None = None) -> str:
+        """Prometheus text exposition; `gauges` adds numeric fields of component stats()."""
+        with self._lock:
+            lines = [
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# TYPE http_responses_total counter",
+            ]
+            for (method, route, status), count in sorted(self.responses.items()):
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"http_responses_total{{{labels}}} {count}")
+            for name, histograms in (
+                ("http_request_duration_seconds", self.latency),
+                ("http_request_db_duration_seconds", self.db_time),
+            ):
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines.extend(histogram.render(name, _labels(method=method, route=route)))
+            for name, totals in (
+                ("http_request_db_queries_total", self.queries),
+                ("http_request_pool_wait_seconds_total", self.pool_wait),
+            ):
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), value in sorted(totals.items()):
+                    lines.append(f"{name}{{{_labels(method=method, route=route)}}} {value}")
+
+        for component, stats in (gauges or {}).items():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name = f"innerplog_{component}_{key}"
+                    lines.extend((f"# TYPE {name} gauge", f"{name} {value}"))
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are timed to their last chunk."""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        self.registry.started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.registry.finished(
+                scope["method"],
+                # The route template, so /posts/{post_id} is one series
+                route.path if route is not None else "<unmatched>",
+                status,
+                time.perf_counter() - started,
+                stats,
+            )
+            current_request_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - context._metrics_started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute every statement run on `engine` to the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,41 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def _encode(key: str, post_id: UUID) -> str:
+    raw = f"{key}|{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> tuple[str, UUID]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    key, post_id = raw.split("|", 1)
+    return key, UUID(post_id)
+
+
+def encode_cursor(created_at: datetime, post_id: UUID) -> str:
+    return _encode(created_at.isoformat(), post_id)
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        created_at, post_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), post_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, post_id: UUID) -> str:
+    return _encode(repr(rank), post_id)
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, UUID]:
+    """Inverse of encode_rank_cursor. Raises ValueError on malformed input."""
+    try:
+        rank, post_id = _decode(cursor)
+        return float(rank), post_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
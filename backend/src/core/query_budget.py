@@ -0,0 +1,138 @@
+"""Per-route limits on the number of SQL statements a request may run.
+
+Routes declare a budget with `dependencies=[query_budget(n)]`; the count includes
+the principal lookup done by get_current_user on a cache miss. Over budget, the
+request is logged or, with QUERY_BUDGET_MODE=raise, fails before the extra
+statement runs, so an N+1 regression shows up at the query that caused it.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from fastapi import Depends, Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+from src.core.metrics import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int | None):
+    """Route dependency declaring the statement budget; None marks a route as unbounded."""
+
+    async def enforce(request: Request):
+        stats = current_request_stats.get()
+        if stats is None:
+            yield
+            return
+        stats.budget = max_queries
+        yield
+        if (
+            max_queries is not None
+            and stats.queries > max_queries
+            and settings.QUERY_BUDGET_MODE != "off"
+        ):
+            route = request.scope.get("route")
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d statements, budget is %d",
+                request.method,
+                route.path if route is not None else request.url.path,
+                stats.queries,
+                max_queries,
+            )
+
+    enforce.max_queries = max_queries
+    return Depends(enforce)
+
+
+def declared_budget(route: APIRoute):
+    """The route's query_budget() value; raises LookupError if it declares none."""
+    for dependency in route.dependencies:
+        if hasattr(dependency.dependency, "max_queries"):
+            return dependency.dependency.max_queries
+    raise LookupError(f"{', '.join(sorted(route.methods))} {route.path}")
+
+
+def routes_without_budget(routes) -> list[str]:
+    """`METHOD path` of every API route missing a query_budget(), for a CI check."""
+    missing = []
+    for route in routes:
+        if isinstance(route, APIRoute):
+            try:
+                declared_budget(route)
+            except LookupError as exc:
+                missing.append(str(exc))
+    return missing
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if (
+        stats is not None
+        and stats.budget is not None
+        and stats.queries >= stats.budget
+        and settings.QUERY_BUDGET_MODE == "raise"
+    ):
+        raise QueryBudgetExceeded(
+            f"Statement {stats.queries + 1} exceeds the budget of {stats.budget}: {statement}"
+        )
+
+
+def enforce_query_budgets(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+class QueryLog:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engines: list[Engine] | None = None) -> Iterator[QueryLog]:
+    """Record every statement run on the API engines inside the block.
+
+        with count_queries() as log:
+            client.get("/api/v1/posts", headers=auth)
+        assert log.count <= 3, log.statements
+    """
+    if engines is None:
+        # Imported here: the session module itself depends on this one
+        from src.db.session import async_engine, replica_engines
+
+        engines = [engine.sync_engine for engine in (async_engine, *replica_engines)]
+
+    log = QueryLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield log
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engines: list[Engine] | None = None):
+    """Fail with the executed statements if the block runs more than `max_queries`."""
+    with count_queries(engines) as log:
+        yield log
+    if log.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{log.count} statements, budget is {max_queries}:\n" + "\n".join(log.statements)
+        )
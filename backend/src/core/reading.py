@@ -0,0 +1,24 @@
+import math
+import re
+
+from src.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_stats(content: str) -> dict:
+    """Excerpt, word count and reading time of a post body, as Post column values."""
+    words = content.split()
+    text = _WHITESPACE.sub(" ", content).strip()
+    excerpt = text
+    if len(text) > settings.EXCERPT_MAX_CHARS:
+        # Cut on a word boundary and mark the truncation
+        cut = text[: settings.EXCERPT_MAX_CHARS + 1].rsplit(" ", 1)[0]
+        excerpt = cut[: settings.EXCERPT_MAX_CHARS - 1].rstrip() + "…"
+    return {
+        "excerpt": excerpt,
+        "word_count": len(words),
+        "reading_time_minutes": max(
+            1, math.ceil(len(words) / settings.READING_WORDS_PER_MINUTE)
+        ),
+    }
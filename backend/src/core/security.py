@@ -1,8 +1,15 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 
+from src.core.cache import TTLCache
 from src.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -16,6 +23,97 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashPool:
+    """Runs bcrypt on a dedicated executor with a bounded backlog.
+
+    Once `workers + queue_size` hashes are in flight, new calls are rejected
+    with 503 instead of piling up behind the ones already running.
+    """
+
+    def __init__(self, workers: int, queue_size: int, kind: str = "thread"):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.kind = kind
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+            executor = self._get_executor()
+
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "queue_depth": max(self.in_flight - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_latency_ms": (
+                    self.total_seconds / self.completed * 1000 if self.completed else 0.0
+                ),
+                "max_latency_ms": self.max_seconds * 1000,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy() 
     expire = datetime.now(timezone.utc) + (
@@ -27,3 +125,23 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 
 def decode_access_token(token: str) -> dict:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+# sha256(token) -> verified claims, each entry living until the token's exp
+verified_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """decode_access_token, skipping signature checks for tokens already verified."""
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = verified_token_cache.get(digest)
+    if payload is not None:
+        return payload
+
+    payload = decode_access_token(token)
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = exp - datetime.now(timezone.utc).timestamp()
+        if remaining > 0:
+            verified_token_cache.set(digest, payload, ttl=remaining)
+    return payload
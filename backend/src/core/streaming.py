@@ -0,0 +1,173 @@
+import codecs
+import json
+import re
+from collections.abc import AsyncIterator
+from typing import Any
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes], max_record_size: int
+) -> AsyncIterator[Any]:
+    """Yield one parsed value per non-blank line; a bad line yields its ValueError.
+
+    Raises ValueError for a line longer than `max_record_size` characters,
+    since the rest of the body cannot be read without buffering it.
+    """
+    # Pieces of the current line; only new text is searched for the newline
+    parts: list[str] = []
+    size = 0
+    line_number = 1
+    async for text in _iter_text(chunks):
+        *lines, tail = text.split("\n")
+        if lines:
+            lines[0] = "".join(parts) + lines[0]
+            parts, size = [], 0
+        for line in lines:
+            _check_record_size(len(line), max_record_size, f"Line {line_number}")
+            if line.strip():
+                yield _loads(line)
+            line_number += 1
+        parts.append(tail)
+        size += len(tail)
+        _check_record_size(size, max_record_size, f"Line {line_number}")
+    line = "".join(parts)
+    if line.strip():
+        yield _loads(line)
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes], max_record_size: int
+) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as they arrive.
+
+    Raises ValueError as soon as the body stops being a well-formed array
+    (bad element, missing separator, data after the closing bracket, early
+    end, an element over `max_record_size` characters), without reading or
+    buffering the rest of it.
+    """
+    parser = _JSONArrayParser(max_record_size)
+    async for text in _iter_text(chunks):
+        for value in parser.feed(text):
+            yield value
+    for value in parser.feed("", final=True):
+        yield value
+    parser.close()
+
+
+class _JSONArrayParser:
+    """Incremental state machine behind iter_json_array.
+
+    Parsing is linear in the body size: consumed text is dropped once per
+    decode attempt rather than once per element, and an element that spans
+    chunks is only re-decoded after the text waiting on it has doubled.
+    """
+
+    def __init__(self, max_record_size: int):
+        self.max_record_size = max_record_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0  # start of the unparsed text in `buffer`
+        self.pending: list[str] = []  # chunks not yet appended to `buffer`
+        self.pending_size = 0
+        self.retry_at = 0  # unparsed size at which to decode a partial element again
+        self.state = "start"  # start -> first (after "[") -> value (after ",") -> next -> end
+        self.index = 0
+
+    def feed(self, text: str, final: bool = False) -> list[Any]:
+        self.pending.append(text)
+        self.pending_size += len(text)
+        unparsed = len(self.buffer) - self.pos + self.pending_size
+        if unparsed < self.retry_at and not final:
+            self._check_size(unparsed)
+            return []
+        buffer = self.buffer = self.buffer[self.pos :] + "".join(self.pending)
+        self.pending, self.pending_size, self.pos, self.retry_at = [], 0, 0, 0
+
+        values = []
+        while True:
+            pos = self.pos = _WHITESPACE.match(buffer, self.pos).end()
+            if pos == len(buffer):
+                return values
+            char = buffer[pos]
+            if self.state == "end":
+                raise ValueError("Unexpected data after the JSON array")
+            if self.state == "start":
+                if char != "[":
+                    raise ValueError("Body must be a JSON array or NDJSON")
+                self.pos, self.state = pos + 1, "first"
+                continue
+            if self.state == "next":
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' after element {self.index - 1}")
+                self.pos, self.state = pos + 1, "value" if char == "," else "end"
+                continue
+            if self.state == "first" and char == "]":
+                self.pos, self.state = pos + 1, "end"
+                continue
+            try:
+                value, end = self.decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as exc:
+                if not _needs_more(buffer, exc):
+                    raise ValueError(f"Malformed JSON at element {self.index}: {exc.msg}")
+                return self._wait(values)
+            # A number may continue in the next chunk; decide once its end is seen
+            if end == len(buffer) and not final:
+                return self._wait(values)
+            self._check_size(end - pos)
+            values.append(value)
+            self.pos, self.state, self.index = end, "next", self.index + 1
+
+    def close(self) -> None:
+        if self.state == "start":
+            raise ValueError("Body must be a JSON array or NDJSON")
+        if self.state != "end":
+            raise ValueError("Unterminated JSON array")
+
+    def _wait(self, values: list[Any]) -> list[Any]:
+        unparsed = len(self.buffer) - self.pos
+        self._check_size(unparsed)
+        self.retry_at = 2 * unparsed
+        return values
+
+    def _check_size(self, size: int) -> None:
+        _check_record_size(size, self.max_record_size, f"Element {self.index}")
+
+
+def _check_record_size(size: int, max_record_size: int, what: str) -> None:
+    if size > max_record_size:
+        raise ValueError(f"{what} is longer than {max_record_size} characters")
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_LITERALS = ("true", "false", "null")
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def _needs_more(buffer: str, exc: json.JSONDecodeError) -> bool:
+    """Whether `exc` only means the element runs past the end of `buffer`."""
+    tail = buffer[exc.pos :]
+    if not tail or exc.msg.startswith("Unterminated string"):
+        return True
+    if exc.msg.startswith("Invalid \\uXXXX escape"):
+        return len(tail) < 6
+    return any(word.startswith(tail) for word in _LITERALS) or set(tail) <= _NUMBER_CHARS
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        return ValueError(f"Invalid JSON: {exc.msg}")
@@ -1,41 +1,70 @@
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.category import Category
+from src.models.post import post_categories
 
 
 class CategoryDAO:
     @staticmethod
-    def get_by_id(db: Session, category_id: str | UUID) -> Category | None:
-        return db.query(Category).filter(Category.id == category_id).first()
+    async def get_by_id(db: AsyncSession, category_id: str | UUID) -> Category | None:
+        return await db.scalar(select(Category).where(Category.id == category_id))
 
     @staticmethod
-    def get_by_name(db: Session, name: str) -> Category | None:
-        return db.query(Category).filter(Category.name == name).first()
+    async def get_by_ids(
+        db: AsyncSession, category_ids: list[str | UUID]
+    ) -> list[Category]:
+        """All categories among `category_ids` in one IN query; missing ids are skipped."""
+        if not category_ids:
+            return []
+        result = await db.scalars(select(Category).where(Category.id.in_(category_ids)))
+        return list(result)
 
     @staticmethod
-    def get_all(db: Session) -> list[Category]:
-        return db.query(Category).order_by(Category.name).all()
+    async def get_by_name(db: AsyncSession, name: str) -> Category | None:
+        return await db.scalar(select(Category).where(Category.name == name))
 
     @staticmethod
-    def create(db: Session, **kwargs) -> Category:
-        category = Category(**kwargs)
-        db.add(category)
-        db.commit()
-        db.refresh(category)
-        return category
+    async def get_all(db: AsyncSession, *, primary: bool = False) -> list[Category]:
+        """`primary` bypasses the replicas, for reads that fill a cache."""
+        query = select(Category).order_by(Category.name).execution_options(use_primary=primary)
+        result = await db.scalars(query)
+        return list(result)
 
     @staticmethod
-    def update(db: Session, category: Category, **kwargs) -> Category:
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(category, key, value)
-        db.commit()
-        db.refresh(category)
+    async def create(db: AsyncSession, **kwargs) -> Category:
+        """INSERT ... RETURNING; raises IntegrityError on a taken name."""
+        category = await db.scalar(insert(Category).values(**kwargs).returning(Category))
+        await db.commit()
         return category
 
     @staticmethod
-    def delete(db: Session, category: Category) -> None:
-        db.delete(category)
-        db.commit()
+    async def update(
+        db: AsyncSession, category_id: str | UUID, **kwargs
+    ) -> tuple[Category, int] | None:
+        """UPDATE ... RETURNING the category and how many posts use it; None if missing."""
+        values = {key: value for key, value in kwargs.items() if value is not None}
+        post_count = (
+            select(func.count())
+            .select_from(post_categories)
+            .where(post_categories.c.category_id == category_id)
+            .scalar_subquery()
+        )
+        row = (
+            await db.execute(
+                update(Category)
+                .where(Category.id == category_id)
+                .values(**values)
+                .returning(Category, post_count)
+                .execution_options(populate_existing=True)
+            )
+        ).one_or_none()
+        await db.commit()
+        return tuple(row) if row else None
+
+    @staticmethod
+    async def delete(db: AsyncSession, category: Category) -> None:
+        await db.delete(category)
+        await db.commit()
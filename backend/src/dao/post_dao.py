@@ -1,122 +1,440 @@
-from uuid import UUID
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import (
+    REGCONFIG,
+    aggregate_order_by,
+    array,
+    insert as pg_insert,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
 
 from src.core.const import PostStatus
-from src.models.post import Post
+from src.core.pagination import encode_cursor, encode_rank_cursor
+from src.models.category import Category
+from src.models.post import SEARCH_CONFIG, Post, post_categories
+from src.models.user import User
+
+POST_COLUMNS = frozenset(
+    {
+        "title",
+        "content",
+        "excerpt",
+        "word_count",
+        "reading_time_minutes",
+        "created_at",
+        "updated_at",
+        "status",
+        "tags",
+        "author_id",
+    }
+)
+SNIPPET_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+)
+
+
+def _category_array(column, post_id):
+    # Ordered by name, so the id and name arrays of one post line up
+    return (
+        select(func.array_agg(aggregate_order_by(column, Category.name)))
+        .join(post_categories, post_categories.c.category_id == Category.id)
+        .where(post_categories.c.post_id == post_id)
+        .scalar_subquery()
+    )
+
+
+def _category_ids(post_id=Post.id):
+    """A post's category ids as an array; NULL when it has none."""
+    return _category_array(Category.id, post_id)
+
+
+def _category_names(post_id=Post.id):
+    """A post's category names, in the same order as _category_ids()."""
+    return _category_array(Category.name, post_id)
+
+
+def _returned(column):
+    # Subqueries are not correlated inside RETURNING: a plain posts.<column>
+    # reference keeps `posts` out of their FROM list
+    return literal_column(f"{Post.__tablename__}.{column.name}", column.type)
+
+
+def _written_columns(with_categories: bool) -> list:
+    """RETURNING list of a post write: the row, its author and optionally its categories.
+
+    Subqueries in RETURNING see the links as they were before the statement,
+    so callers that rewrite the links already know the categories instead.
+    """
+    columns = [column for column in Post.__table__.c if column.key != "search_vector"]
+    author_id, post_id = _returned(Post.author_id), _returned(Post.id)
+    columns += [
+        select(User.username)
+        .where(User.id == author_id)
+        .scalar_subquery()
+        .label("author_username"),
+        select(User.fullname)
+        .where(User.id == author_id)
+        .scalar_subquery()
+        .label("author_fullname"),
+    ]
+    if with_categories:
+        columns += [
+            _category_ids(post_id).label("category_ids"),
+            _category_names(post_id).label("category_names"),
+        ]
+    return columns
 
 
 class PostDAO:
     @staticmethod
-    def get_by_id(db: Session, post_id: str | UUID) -> Post | None:
-        return (
-            db.query(Post)
+    async def _paginate(
+        db: AsyncSession,
+        query: Select,
+        *,
+        page: int,
+        page_size: int,
+        cursor: tuple[datetime, UUID] | None,
+    ) -> tuple[list[Post], str | None]:
+        """Slice one page newest-first; keyset on (created_at, id) when a cursor is given."""
+        if cursor:
+            query = query.where(tuple_(Post.created_at, Post.id) < tuple_(*cursor))
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        result = await db.execute(
+            query.order_by(Post.created_at.desc(), Post.id.desc()).limit(page_size + 1)
+        )
+        posts = list(result.unique().scalars())
+        next_cursor = None
+        if len(posts) > page_size:
+            posts = posts[:page_size]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+        return posts, next_cursor
+
+    @staticmethod
+    def _list_options(fields: set[str] | None) -> list:
+        """Loader options for a list query; with `fields`, unrequested columns are never selected."""
+        if fields is None:
+            return [joinedload(Post.author), joinedload(Post.categories)]
+
+        columns = [getattr(Post, name) for name in sorted(POST_COLUMNS & fields)]
+        options = [load_only(Post.id, Post.created_at, *columns, raiseload=True)]
+        if "author" in fields:
+            options.append(
+                joinedload(Post.author).load_only(User.id, User.username, User.fullname)
+            )
+        if "categories" in fields:
+            options.append(joinedload(Post.categories))
+        return options
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, post_id: str | UUID) -> Post | None:
+        result = await db.execute(
+            select(Post)
             .options(joinedload(Post.author), joinedload(Post.categories))
-            .filter(Post.id == post_id)
-            .first()
+            .where(Post.id == post_id)
         )
+        return result.unique().scalar_one_or_none()
 
     @staticmethod
-    def get_public_and_own(
-        db: Session,
+    async def get_version(db: AsyncSession, post_id: str | UUID):
+        """(author_id, status, updated_at) only, without hydrating the post."""
+        result = await db.execute(
+            select(Post.author_id, Post.status, Post.updated_at).where(Post.id == post_id)
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    def visible_filters(
         current_user_id: UUID,
         *,
-        page: int = 1,
-        page_size: int = 10,
         status_filter: str | None = None,
         tag_filter: str | None = None,
         author_id: UUID | None = None,
-    ) -> tuple[list[Post], int]:
-        """Return posts visible to a normal user: all their own + others' public posts."""
-        query = db.query(Post).options(
-            joinedload(Post.author), joinedload(Post.categories)
-        )
-
+    ) -> list:
+        """Filters for posts visible to a normal user: all their own + others' public posts."""
         if author_id:
             if author_id == current_user_id:
-                query = query.filter(Post.author_id == author_id)
+                filters = [Post.author_id == author_id]
             else:
-                query = query.filter(
-                    Post.author_id == author_id, Post.status == PostStatus.PUBLIC
-                )
+                filters = [Post.author_id == author_id, Post.status == PostStatus.PUBLIC]
         else:
-            query = query.filter(
+            filters = [
                 or_(
                     Post.author_id == current_user_id,
                     Post.status == PostStatus.PUBLIC,
                 )
-            )
+            ]
 
         if status_filter:
-            query = query.filter(Post.status == status_filter)
+            filters.append(Post.status == status_filter)
         if tag_filter:
-            query = query.filter(Post.tags.any(tag_filter))
-
-        total = query.count()
-        posts = (
-            query.order_by(Post.created_at.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
+            # @> rather than = ANY() so the GIN index on tags can be used
+            # Typed like the column, or inlined literals (EXPLAIN) compare varchar[] to text[]
+            filters.append(Post.tags.contains(cast(array([tag_filter]), Post.tags.type)))
+        return filters
+
+    @staticmethod
+    def admin_filters(*, status_filter: str | None = None) -> list:
+        return [Post.status == status_filter] if status_filter else []
+
+    @staticmethod
+    async def get_public_and_own(
+        db: AsyncSession,
+        current_user_id: UUID,
+        *,
+        page: int = 1,
+        page_size: int = 10,
+        status_filter: str | None = None,
+        tag_filter: str | None = None,
+        author_id: UUID | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+        fields: set[str] | None = None,
+    ) -> tuple[list[Post], str | None]:
+        """Return posts visible to a normal user: all their own + others' public posts."""
+        query = (
+            select(Post)
+            .options(*PostDAO._list_options(fields))
+            .where(
+                *PostDAO.visible_filters(
+                    current_user_id,
+                    status_filter=status_filter,
+                    tag_filter=tag_filter,
+                    author_id=author_id,
+                )
+            )
+        )
+        return await PostDAO._paginate(
+            db, query, page=page, page_size=page_size, cursor=cursor
         )
-        return posts, total
 
     @staticmethod
-    def get_all(
-        db: Session,
+    async def get_all(
+        db: AsyncSession,
         *,
         page: int = 1,
         page_size: int = 10,
         status_filter: str | None = None,
-    ) -> tuple[list[Post], int]:
+        cursor: tuple[datetime, UUID] | None = None,
+        fields: set[str] | None = None,
+    ) -> tuple[list[Post], str | None]:
         """Admin: return all posts regardless of ownership/status."""
-        query = db.query(Post).options(
-            joinedload(Post.author), joinedload(Post.categories)
+        query = (
+            select(Post)
+            .options(*PostDAO._list_options(fields))
+            .where(*PostDAO.admin_filters(status_filter=status_filter))
         )
-        if status_filter:
-            query = query.filter(Post.status == status_filter)
-
-        total = query.count()
-        posts = (
-            query.order_by(Post.created_at.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
+        return await PostDAO._paginate(
+            db, query, page=page, page_size=page_size, cursor=cursor
+        )
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        filters: list,
+        query_text: str,
+        *,
+        page_size: int = 10,
+        cursor: tuple[float, UUID] | None = None,
+        fields: set[str] | None = None,
+    ) -> tuple[list[tuple[Post, float, str]], str | None]:
+        """Rank matches of `query_text` by relevance and highlight a snippet for each.
+
+        Matching and ranking run over the GIN-indexed search_vector; snippets
+        are only generated for the rows of the returned page.
+        """
+        tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query_text)
+        rank = func.ts_rank(Post.search_vector, tsquery)
+        ranked = select(Post.id, rank.label("rank")).where(
+            Post.search_vector.op("@@")(tsquery), *filters
+        )
+        if cursor:
+            ranked = ranked.where(tuple_(rank, Post.id) < tuple_(*cursor))
+        ranked = (
+            ranked.order_by(rank.desc(), Post.id.desc()).limit(page_size + 1).subquery()
+        )
+
+        snippet = func.ts_headline(
+            cast(SEARCH_CONFIG, REGCONFIG), Post.content, tsquery, SNIPPET_OPTIONS
+        )
+        result = await db.execute(
+            select(Post, ranked.c.rank, snippet)
+            .join(ranked, Post.id == ranked.c.id)
+            .options(*PostDAO._list_options(fields))
+            .order_by(ranked.c.rank.desc(), Post.id.desc())
+        )
+        hits = [tuple(row) for row in result.unique()]
+
+        next_cursor = None
+        if len(hits) > page_size:
+            hits = hits[:page_size]
+            post, rank_value, _ = hits[-1]
+            next_cursor = encode_rank_cursor(rank_value, post.id)
+        return hits, next_cursor
+
+    @staticmethod
+    async def stream_by_author(
+        db: AsyncSession, author_id: UUID, *, chunk_size: int = 1000
+    ) -> AsyncIterator:
+        """Yield an author's posts as flat rows through a server-side cursor.
+
+        Category arrays are NULL for posts without categories.
+        """
+        result = await db.stream(
+            select(
+                Post.id,
+                Post.title,
+                Post.content,
+                Post.created_at,
+                Post.updated_at,
+                Post.status,
+                Post.tags,
+                _category_ids().label("category_ids"),
+                _category_names().label("categories"),
+            )
+            .where(Post.author_id == author_id)
+            .order_by(Post.created_at, Post.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for row in result.mappings():
+            yield row
+
+    @staticmethod
+    async def count(db: AsyncSession, filters: list, *, primary: bool = False) -> int:
+        """Exact count over posts only, without the author/category joins.
+
+        `primary` bypasses the replicas, for counts that fill a cache.
+        """
+        query = select(func.count(Post.id)).where(*filters)
+        return await db.scalar(query.execution_options(use_primary=primary))
+
+    @staticmethod
+    async def estimate_count(db: AsyncSession, filters: list) -> int:
+        """Row estimate from the Postgres planner; no rows are scanned."""
+        statement = select(Post.id).where(*filters).compile(
+            dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
         )
-        return posts, total
+        connection = await db.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    async def create(
+        db: AsyncSession, *, categories: list[Category], **values
+    ) -> RowMapping:
+        """Insert a post and its category links in one INSERT ... RETURNING statement."""
+        # Client-side id, so the links can be written by a CTE of the same statement
+        values.setdefault("id", uuid4())
+        statement = insert(Post).values(**values).returning(*_written_columns(False))
+        if categories:
+            statement = statement.add_cte(
+                insert(post_categories)
+                .values(
+                    [
+                        {"post_id": values["id"], "category_id": category.id}
+                        for category in categories
+                    ]
+                )
+                .cte("links")
+            )
+        row = (await db.execute(statement)).mappings().one()
+        await db.commit()
+        return row
 
     @staticmethod
-    def create(db: Session, **kwargs) -> Post:
-        categories = kwargs.pop("categories", [])
-        post = Post(**kwargs)
-        post.categories = categories
-        db.add(post)
-        db.commit()
-        db.refresh(post)
-        return post
+    async def bulk_create(
+        db: AsyncSession, posts: list[dict], links: list[dict]
+    ) -> None:
+        """Insert many posts (with client-side ids) and their category links in one commit."""
+        if posts:
+            await db.execute(insert(Post), posts)
+        if links:
+            await db.execute(insert(post_categories), links)
+        await db.commit()
 
     @staticmethod
-    def update(db: Session, post: Post, **kwargs) -> Post:
-        categories = kwargs.pop("categories", None)
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(post, key, value)
+    async def update(
+        db: AsyncSession,
+        post_id: UUID,
+        *,
+        author_id: UUID | None = None,
+        categories: list[Category] | None = None,
+        **values,
+    ) -> RowMapping | None:
+        """Update a post, and replace its category links, in one UPDATE ... RETURNING.
+
+        With `author_id`, only that author's post is touched. None values are
+        left unchanged. Returns None when no post matched.
+        """
+        target = [Post.id == post_id]
+        if author_id is not None:
+            target.append(Post.author_id == author_id)
+        values = {key: value for key, value in values.items() if value is not None}
+        # Always set, so link-only changes still move the post's validators
+        values["updated_at"] = func.now()
+        statement = (
+            update(Post)
+            .where(*target)
+            .values(**values)
+            .returning(*_written_columns(categories is None))
+            .execution_options(synchronize_session=False)
+        )
         if categories is not None:
-            post.categories = categories
-        db.commit()
-        db.refresh(post)
-        return post
+            # Both CTEs select the post through `target`, so they do nothing when
+            # the UPDATE matches nothing; neither depends on the other running first
+            category_ids = [category.id for category in categories]
+            statement = statement.add_cte(
+                delete(post_categories)
+                .where(
+                    post_categories.c.post_id.in_(select(Post.id).where(*target)),
+                    post_categories.c.category_id.not_in(category_ids),
+                )
+                .cte("unlinked")
+            ).add_cte(
+                pg_insert(post_categories)
+                .from_select(
+                    ["post_id", "category_id"],
+                    # Every chosen category for the one target post
+                    select(Post.id, Category.id)
+                    .select_from(Post)
+                    .join(Category, true())
+                    .where(*target, Category.id.in_(category_ids)),
+                )
+                .on_conflict_do_nothing()
+                .cte("linked")
+            )
+        row = (await db.execute(statement)).mappings().one_or_none()
+        await db.commit()
+        return row
 
     @staticmethod
-    def delete(db: Session, post: Post) -> None:
-        db.delete(post)
-        db.commit()
+    async def delete(db: AsyncSession, post: Post) -> None:
+        await db.delete(post)
+        await db.commit()
 
     @staticmethod
-    def count_by_category(db: Session, category_id: UUID) -> int:
-        return (
-            db.query(Post)
-            .filter(Post.categories.any(id=category_id))
-            .count()
+    async def count_by_category(db: AsyncSession, category_id: UUID) -> int:
+        return await db.scalar(
+            select(func.count(Post.id)).where(Post.categories.any(id=category_id))
         )
@@ -0,0 +1,37 @@
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.const import PostStatus
+from src.models.tag_count import TagCount
+
+
+class TagDAO:
+    @staticmethod
+    async def get_counts(
+        db: AsyncSession,
+        *,
+        author_id: UUID | None = None,
+        include_private: bool = False,
+        limit: int = 50,
+        primary: bool = False,
+    ) -> list[tuple[str, int]]:
+        """Tag usage read from the tag_counts aggregate, most used first.
+
+        `primary` bypasses the replicas, for reads that fill a cache.
+        """
+        total = func.sum(TagCount.post_count).label("count")
+        query = select(TagCount.tag, total).where(TagCount.post_count > 0)
+        if author_id:
+            query = query.where(TagCount.author_id == author_id)
+        if not include_private:
+            query = query.where(TagCount.status == PostStatus.PUBLIC)
+
+        result = await db.execute(
+            query.group_by(TagCount.tag)
+            .order_by(total.desc(), TagCount.tag)
+            .limit(limit)
+            .execution_options(use_primary=primary)
+        )
+        return [tuple(row) for row in result]
@@ -1,49 +1,59 @@
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.user import User
 
 
 class UserDAO:
     @staticmethod
-    def get_by_id(db: Session, user_id: str | UUID) -> User | None:
-        return db.query(User).filter(User.id == user_id).first()
+    async def get_by_id(
+        db: AsyncSession, user_id: str | UUID, *, primary: bool = False
+    ) -> User | None:
+        """`primary` bypasses the replicas, for reads that fill a cache."""
+        query = select(User).where(User.id == user_id).execution_options(use_primary=primary)
+        return await db.scalar(query)
 
     @staticmethod
-    def get_by_username(db: Session, username: str) -> User | None:
-        return db.query(User).filter(User.username == username).first()
+    async def get_by_username(db: AsyncSession, username: str) -> User | None:
+        return await db.scalar(select(User).where(User.username == username))
 
     @staticmethod
-    def get_by_email(db: Session, email: str) -> User | None:
-        return db.query(User).filter(User.email == email).first()
+    async def get_by_email(db: AsyncSession, email: str) -> User | None:
+        return await db.scalar(select(User).where(User.email == email))
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 50) -> list[User]:
-        return db.query(User).offset(skip).limit(limit).all()
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 50) -> list[User]:
+        result = await db.scalars(select(User).offset(skip).limit(limit))
+        return list(result)
 
     @staticmethod
-    def count(db: Session) -> int:
-        return db.query(User).count()
+    async def count(db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(User.id)))
 
     @staticmethod
-    def create(db: Session, **kwargs) -> User:
-        user = User(**kwargs)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    async def create(db: AsyncSession, **kwargs) -> User:
+        """INSERT ... RETURNING; raises IntegrityError on a taken username or email."""
+        user = await db.scalar(insert(User).values(**kwargs).returning(User))
+        await db.commit()
         return user
 
     @staticmethod
-    def update(db: Session, user: User, **kwargs) -> User:
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(user, key, value)
-        db.commit()
-        db.refresh(user)
+    async def update(db: AsyncSession, user_id: str | UUID, **kwargs) -> User | None:
+        """UPDATE ... RETURNING; None values are left unchanged. None if no user matched."""
+        values = {key: value for key, value in kwargs.items() if value is not None}
+        user = await db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        await db.commit()
         return user
 
     @staticmethod
-    def delete(db: Session, user: User) -> None:
-        db.delete(user)
-        db.commit()
+    async def delete(db: AsyncSession, user: User) -> None:
+        await db.delete(user)
+        await db.commit()
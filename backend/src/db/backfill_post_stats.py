@@ -0,0 +1,72 @@
+"""Fill excerpt, word_count and reading_time_minutes for posts written before they existed.
+
+    python -m src.db.backfill_post_stats [--batch-size 1000]
+
+Walks posts missing stats in primary-key order, one short transaction per
+batch, so it can run against a live database and resume after interruption.
+"""
+
+import argparse
+import time
+
+from sqlalchemy import bindparam, select, update
+
+from src.core.reading import content_stats
+from src.db.session import engine
+from src.models.post import Post
+
+posts = Post.__table__
+
+UPDATE_STATS = (
+    update(posts)
+    # A post edited since the batch was read already has fresh stats; Postgres
+    # re-checks this against the committed row, so the edit is never overwritten
+    .where(posts.c.id == bindparam("post_id"), posts.c.word_count.is_(None))
+    .values(
+        # Bind names must differ from the column names they set
+        excerpt=bindparam("new_excerpt"),
+        word_count=bindparam("new_word_count"),
+        reading_time_minutes=bindparam("new_reading_time_minutes"),
+        # Keep updated_at (and the ETags derived from it) as they were
+        updated_at=posts.c.updated_at,
+    )
+)
+
+
+def backfill(batch_size: int) -> int:
+    done = 0
+    last_id = None
+    while True:
+        with engine.begin() as connection:
+            query = select(posts.c.id, posts.c.content).where(posts.c.word_count.is_(None))
+            if last_id is not None:
+                query = query.where(posts.c.id > last_id)
+            rows = connection.execute(query.order_by(posts.c.id).limit(batch_size)).all()
+            if not rows:
+                return done
+            connection.execute(
+                UPDATE_STATS,
+                [
+                    {
+                        "post_id": post_id,
+                        **{f"new_{key}": value for key, value in content_stats(content).items()},
+                    }
+                    for post_id, content in rows
+                ],
+            )
+        done += len(rows)
+        last_id = rows[-1].id
+        print(f"backfilled {done} posts")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.db.backfill_post_stats")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    done = backfill(args.batch_size)
+    print(f"done: {done} posts in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = "23505"
+
+
+def unique_violation(error: IntegrityError) -> str | None:
+    """Name of the unique index `error` tripped over; None for any other integrity error."""
+    orig = error.orig
+    # asyncpg (through SQLAlchemy's adapter) and psycopg2 expose these differently
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if code != UNIQUE_VIOLATION:
+        return None
+    cause = orig.__cause__
+    if cause is not None and hasattr(cause, "constraint_name"):
+        return cause.constraint_name
+    return getattr(getattr(orig, "diag", None), "constraint_name", None)
@@ -0,0 +1,68 @@
+"""Schema migration command.
+
+    python -m src.db.migrate upgrade [--explain] [--analyze]
+    python -m src.db.migrate current
+    python -m src.db.migrate explain [--analyze]
+
+`--explain` prints the plans of the PostDAO hot-path queries before and after
+the upgrade. Runs on the blocking engine. The API can keep serving, except
+while revision 2 adds search_vector to a database created before full-text
+search: that rewrites `posts` under an exclusive lock (see v0002).
+"""
+
+import argparse
+
+from src.db.migrations import get_current_version, head_revision, upgrade
+from src.db.query_plans import explain
+from src.db.session import engine
+
+
+def _plans(analyze: bool) -> dict[str, str]:
+    with engine.connect() as connection:
+        return explain(connection, analyze=analyze)
+
+
+def _print_plans(title: str, plans: dict[str, str]) -> None:
+    print(f"=== {title} ===")
+    for name, plan in plans.items():
+        print(f"--- {name}\n{plan}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.db.migrate")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("--target", type=int, help="stop at this revision")
+    upgrade_parser.add_argument(
+        "--explain", action="store_true", help="report query plans before and after"
+    )
+    upgrade_parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE")
+    commands.add_parser("current", help="show applied and head revisions")
+    explain_parser = commands.add_parser("explain", help="show hot-path query plans")
+    explain_parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE")
+    args = parser.parse_args()
+
+    if args.command == "current":
+        with engine.connect() as connection:
+            current = get_current_version(connection)
+        print(f"current: {current}, head: {head_revision()}")
+    elif args.command == "explain":
+        _print_plans("plans", _plans(args.analyze))
+    else:
+        # The baseline creates the tables, so there is nothing to explain before it
+        with engine.connect() as connection:
+            before = args.explain and get_current_version(connection) > 0
+        plans_before = _plans(args.analyze) if before else None
+        applied = upgrade(engine, target=args.target)
+        for migration in applied:
+            print(f"applied {migration.revision:04d}: {migration.description}")
+        if not applied:
+            print("schema is up to date")
+        if args.explain:
+            if plans_before:
+                _print_plans("before", plans_before)
+            _print_plans("after", _plans(args.analyze))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Versioned schema migrations.
+
+Each module in `versions/` defines `revision`, `description`, `transactional`
+and `upgrade(connection)`. Applied revisions are recorded in `schema_version`.
+Non-transactional migrations (e.g. CREATE INDEX CONCURRENTLY) run in autocommit.
+"""
+
+import importlib
+import pkgutil
+from types import ModuleType
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.db.migrations import versions
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def load_migrations() -> list[ModuleType]:
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    return sorted(modules, key=lambda module: module.revision)
+
+
+def head_revision() -> int:
+    migrations = load_migrations()
+    return migrations[-1].revision if migrations else 0
+
+
+def get_current_version(connection: Connection) -> int:
+    """Highest applied revision, 0 for a database that has never been migrated."""
+    if connection.scalar(text("SELECT to_regclass('schema_version')")) is None:
+        return 0
+    return connection.scalar(select(func.max(schema_version.c.version))) or 0
+
+
+async def check_schema(engine: AsyncEngine) -> int:
+    """Startup guard: one query against schema_version instead of reflecting every table.
+
+    A database ahead of this code is accepted (rolling deploys); one behind it is not.
+    """
+    try:
+        async with engine.connect() as connection:
+            current = await connection.scalar(select(func.max(schema_version.c.version)))
+    except ProgrammingError:  # schema_version does not exist yet
+        current = None
+    current = current or 0
+    head = head_revision()
+    if current < head:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, this build needs {head}; "
+            "run `python -m src.db.migrate upgrade`"
+        )
+    return current
+
+
+def _apply(connection: Connection, migration: ModuleType) -> None:
+    migration.upgrade(connection)
+    connection.execute(
+        schema_version.insert().values(
+            version=migration.revision, description=migration.description
+        )
+    )
+
+
+def upgrade(engine: Engine, target: int | None = None) -> list[ModuleType]:
+    """Apply pending migrations up to `target` (default: head). Returns the ones applied."""
+    with engine.begin() as connection:
+        schema_version.create(connection, checkfirst=True)
+        current = get_current_version(connection)
+
+    pending = [
+        migration
+        for migration in load_migrations()
+        if current < migration.revision and (target is None or migration.revision <= target)
+    ]
+    for migration in pending:
+        if migration.transactional:
+            with engine.begin() as connection:
+                _apply(connection, migration)
+        else:
+            with engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as connection:
+                _apply(connection, migration)
+    return pending
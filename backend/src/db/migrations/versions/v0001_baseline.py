@@ -0,0 +1,79 @@
+"""Baseline: the schema the old startup create_all built, frozen as DDL.
+
+Written out rather than generated from the models, so later model changes
+reach the database only through later migrations. Every statement is
+idempotent, so a database created by create_all is adopted as it is.
+Full-text search and the tag_counts aggregate came later: 0002 and 0003.
+"""
+
+from sqlalchemy.engine import Connection
+
+revision = 1
+description = "baseline schema"
+transactional = True
+
+ENUM_TYPES = {
+    "account_status_enum": ("active", "banned"),
+    "role_enum": ("admin", "writer"),
+    "post_status_enum": ("public", "draft", "banned"),
+}
+
+TABLES = (
+    """
+CREATE TABLE IF NOT EXISTS users (
+    id uuid PRIMARY KEY,
+    username varchar NOT NULL,
+    email varchar NOT NULL,
+    hashed_password varchar NOT NULL,
+    fullname varchar,
+    dob date,
+    description varchar,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    account_status account_status_enum NOT NULL DEFAULT 'active',
+    role role_enum NOT NULL DEFAULT 'writer'
+)
+""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+    """
+CREATE TABLE IF NOT EXISTS categories (
+    id uuid PRIMARY KEY,
+    name varchar NOT NULL
+)
+""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_categories_name ON categories (name)",
+    """
+CREATE TABLE IF NOT EXISTS posts (
+    id uuid PRIMARY KEY,
+    title varchar NOT NULL,
+    content text NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    status post_status_enum NOT NULL DEFAULT 'draft',
+    tags varchar[],
+    author_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE
+)
+""",
+    """
+CREATE TABLE IF NOT EXISTS post_categories (
+    post_id uuid REFERENCES posts (id) ON DELETE CASCADE,
+    category_id uuid REFERENCES categories (id) ON DELETE CASCADE,
+    PRIMARY KEY (post_id, category_id)
+)
+""",
+)
+
+# The hot-path indexes on posts and post_categories are built by 0004 with
+# CREATE INDEX CONCURRENTLY, not here.
+
+
+def upgrade(connection: Connection) -> None:
+    for name, labels in ENUM_TYPES.items():
+        values = ", ".join(f"'{label}'" for label in labels)
+        connection.exec_driver_sql(
+            f"DO $$ BEGIN CREATE TYPE {name} AS ENUM ({values}); "
+            "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+        )
+    for statement in TABLES:
+        connection.exec_driver_sql(statement)
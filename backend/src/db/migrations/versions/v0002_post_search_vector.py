@@ -0,0 +1,26 @@
+"""Generated search_vector column on posts for full-text search.
+
+Its GIN index is built by 0004. Adding a stored generated column rewrites
+`posts` under an ACCESS EXCLUSIVE lock, blocking reads and writes for the
+duration; stop the API for this revision. A database created by create_all
+after full-text search was added already has the column, and this is a no-op.
+"""
+
+from sqlalchemy.engine import Connection
+
+revision = 2
+description = "posts.search_vector"
+transactional = True
+
+SEARCH_VECTOR = (
+    "tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    ") STORED"
+)
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        f"ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector {SEARCH_VECTOR}"
+    )
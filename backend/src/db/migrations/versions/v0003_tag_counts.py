@@ -0,0 +1,73 @@
+"""tag_counts aggregate behind the tag facet, kept current by a trigger on posts.
+
+The table is filled from the existing posts in the same transaction that
+installs the trigger. Post writes wait on a SHARE lock until it commits, so
+none is lost or counted twice; reads are not blocked. Recount later with
+`python -m src.db.rebuild_tag_counts`.
+"""
+
+from sqlalchemy.engine import Connection
+
+revision = 3
+description = "tag_counts table and its trigger"
+transactional = True
+
+TABLE = (
+    """
+CREATE TABLE IF NOT EXISTS tag_counts (
+    author_id uuid REFERENCES users (id) ON DELETE CASCADE,
+    tag varchar,
+    status post_status_enum,
+    post_count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (author_id, tag, status)
+)
+""",
+    "CREATE INDEX IF NOT EXISTS ix_tag_counts_status_tag ON tag_counts (status, tag)",
+)
+
+TRIGGER = (
+    """
+CREATE OR REPLACE FUNCTION posts_maintain_tag_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tag_counts SET post_count = post_count - 1
+        WHERE author_id = OLD.author_id
+          AND status = OLD.status
+          AND tag = ANY(COALESCE(OLD.tags, '{}'));
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO tag_counts (author_id, tag, status, post_count)
+        SELECT DISTINCT NEW.author_id, t, NEW.status, 1
+        FROM unnest(COALESCE(NEW.tags, '{}')) AS t
+        ON CONFLICT (author_id, tag, status)
+        DO UPDATE SET post_count = tag_counts.post_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS posts_tag_counts ON posts",
+    """
+CREATE TRIGGER posts_tag_counts
+AFTER INSERT OR DELETE OR UPDATE OF tags, status, author_id ON posts
+FOR EACH ROW EXECUTE FUNCTION posts_maintain_tag_counts()
+""",
+)
+
+FILL = (
+    "DELETE FROM tag_counts",
+    """
+INSERT INTO tag_counts (author_id, tag, status, post_count)
+SELECT author_id, tag, status, count(*)
+FROM (SELECT DISTINCT id, author_id, status, unnest(tags) AS tag FROM posts) AS t
+GROUP BY author_id, tag, status
+""",
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for statement in TABLE:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("LOCK TABLE posts IN SHARE MODE")
+    for statement in (*TRIGGER, *FILL):
+        connection.exec_driver_sql(statement)
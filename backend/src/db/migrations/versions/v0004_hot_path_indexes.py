@@ -0,0 +1,48 @@
+"""Indexes for the PostDAO hot paths, built without blocking writes.
+
+CONCURRENTLY cannot run inside a transaction, so this migration runs in
+autocommit. A build that was interrupted leaves an INVALID index behind;
+it is dropped and rebuilt instead of being skipped by IF NOT EXISTS.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = 4
+description = "hot-path indexes for feeds, tag/search filters and category lookups"
+transactional = False
+
+INDEXES = {
+    # Admin list and unfiltered keyset pagination
+    "ix_posts_created_at_id": "posts (created_at DESC, id DESC)",
+    # Author pages and the export cursor
+    "ix_posts_author_created_at_id": "posts (author_id, created_at DESC, id DESC)",
+    # Public side of the feed's (own OR public) filter
+    "ix_posts_public_created_at_id": (
+        "posts (created_at DESC, id DESC) WHERE status = 'public'"
+    ),
+    # Admin list filtered by status
+    "ix_posts_status_created_at_id": "posts (status, created_at DESC, id DESC)",
+    "ix_posts_tags": "posts USING gin (tags)",
+    "ix_posts_search_vector": "posts USING gin (search_vector)",
+    # count_by_category and category deletes
+    "ix_post_categories_category_id": "post_categories (category_id, post_id)",
+}
+
+INVALID_INDEX = text(
+    """
+SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+WHERE c.relname = :name AND NOT i.indisvalid
+"""
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for name, definition in INDEXES.items():
+        if connection.scalar(INVALID_INDEX, {"name": name}):
+            connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        connection.exec_driver_sql(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"
+        )
+    # Fresh statistics so the planner picks the new indexes up right away
+    connection.exec_driver_sql("ANALYZE posts, post_categories")
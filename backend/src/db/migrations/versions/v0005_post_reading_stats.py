@@ -0,0 +1,20 @@
+"""Stored excerpt, word count and reading time for feed cards.
+
+Nullable columns without defaults, so adding them is a catalog-only change.
+Existing rows are filled by `python -m src.db.backfill_post_stats`.
+"""
+
+from sqlalchemy.engine import Connection
+
+revision = 5
+description = "posts.excerpt, word_count, reading_time_minutes"
+transactional = True
+
+
+def upgrade(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        "ALTER TABLE posts "
+        "ADD COLUMN IF NOT EXISTS excerpt text, "
+        "ADD COLUMN IF NOT EXISTS word_count integer, "
+        "ADD COLUMN IF NOT EXISTS reading_time_minutes integer"
+    )
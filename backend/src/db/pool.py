@@ -0,0 +1,99 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics import current_request_stats
+
+
+class PoolMetrics:
+    """Checkout counters for a connection pool; safe to read from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def begin(self) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def end(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_checkout_ms": (
+                    self.total_wait_seconds / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "max_checkout_ms": self.max_wait_seconds * 1000,
+                "total_wait_ms": self.total_wait_seconds * 1000,
+            }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout, including time spent waiting."""
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kwargs):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs)
+        # As configured; -1 means overflow is unlimited and checkouts never wait
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        self.metrics.begin()
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.metrics.end(waited, timed_out)
+            request_stats = current_request_stats.get()
+            if request_stats is not None:
+                request_stats.pool_wait_seconds += waited
+
+
+def pool_stats(pool: InstrumentedAsyncQueuePool) -> dict:
+    """Live occupancy of `pool` plus its checkout metrics."""
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool.max_overflow,
+        "timeout_seconds": pool.timeout(),
+        **pool.metrics.stats(),
+    }
+
+
+def pool_saturated(pool: InstrumentedAsyncQueuePool, max_waiting: int) -> bool:
+    """Every connection is checked out and at least `max_waiting` callers queue for one.
+
+    A pool with unlimited overflow opens a new connection instead of queueing,
+    so it is never saturated by its checkout count.
+    """
+    if pool.max_overflow < 0:
+        return False
+    return (
+        pool.checkedout() >= pool.size() + pool.max_overflow
+        and pool.metrics.waiting >= max_waiting
+    )
@@ -0,0 +1,69 @@
+"""Planner output for the PostDAO hot-path queries, used to compare schema changes."""
+
+import uuid
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection
+
+from src.core.const import PostStatus
+from src.dao.post_dao import PostDAO
+from src.models.post import Post, post_categories
+
+PAGE = 11  # page_size + 1, as PostDAO._paginate fetches
+
+
+def _sample(connection: Connection) -> tuple[uuid.UUID, str, uuid.UUID]:
+    """A real author, tag and category, so the plans reflect actual selectivity."""
+    row = connection.execute(
+        text("SELECT author_id, tags[1] FROM posts WHERE cardinality(tags) > 0 LIMIT 1")
+    ).first()
+    author_id, tag = row if row else (uuid.uuid4(), "journal")
+    category_id = connection.scalar(select(post_categories.c.category_id).limit(1))
+    return author_id, tag, category_id or uuid.uuid4()
+
+
+def hot_path_queries(connection: Connection) -> dict:
+    author_id, tag, category_id = _sample(connection)
+    newest = (Post.created_at.desc(), Post.id.desc())
+    return {
+        "feed": select(Post)
+        .where(*PostDAO.visible_filters(author_id))
+        .order_by(*newest)
+        .limit(PAGE),
+        "own posts": select(Post)
+        .where(*PostDAO.visible_filters(author_id, author_id=author_id))
+        .order_by(*newest)
+        .limit(PAGE),
+        "author's public posts": select(Post)
+        .where(*PostDAO.visible_filters(uuid.uuid4(), author_id=author_id))
+        .order_by(*newest)
+        .limit(PAGE),
+        "feed by tag": select(Post)
+        .where(*PostDAO.visible_filters(author_id, tag_filter=tag))
+        .order_by(*newest)
+        .limit(PAGE),
+        "admin list": select(Post).order_by(*newest).limit(PAGE),
+        "admin list by status": select(Post)
+        .where(*PostDAO.admin_filters(status_filter=PostStatus.PUBLIC))
+        .order_by(*newest)
+        .limit(PAGE),
+        "count by category": select(func.count(Post.id)).where(
+            Post.categories.any(id=category_id)
+        ),
+        "export": select(Post.id)
+        .where(Post.author_id == author_id)
+        .order_by(Post.created_at, Post.id),
+    }
+
+
+def explain(connection: Connection, analyze: bool = False) -> dict[str, str]:
+    """Text plans keyed by query name; `analyze` executes the queries for real timings."""
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    plans = {}
+    for name, query in hot_path_queries(connection).items():
+        statement = query.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+        rows = connection.exec_driver_sql(f"EXPLAIN ({options}) {statement}")
+        plans[name] = "\n".join(row[0] for row in rows)
+    return plans
@@ -0,0 +1,32 @@
+"""Recount the tag_counts aggregate from posts.
+
+    python -m src.db.rebuild_tag_counts
+
+The table and the trigger that keeps it current come from migration 0003;
+this only repairs drift, e.g. after the trigger was disabled for a bulk load.
+Post writes wait until the recount commits. Safe to re-run.
+"""
+
+import time
+
+from src.db.session import engine
+from src.models.tag_count import REBUILD_TAG_COUNTS
+
+
+def rebuild() -> int:
+    with engine.begin() as connection:
+        # Blocks post writes until commit, so the recount and the trigger agree
+        connection.exec_driver_sql("LOCK TABLE posts IN SHARE MODE")
+        for statement in REBUILD_TAG_COUNTS:
+            connection.exec_driver_sql(statement)
+        return connection.exec_driver_sql("SELECT count(*) FROM tag_counts").scalar()
+
+
+def main() -> None:
+    started = time.perf_counter()
+    rows = rebuild()
+    print(f"done: {rows} tag counts in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
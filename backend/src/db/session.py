@@ -1,15 +1,105 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import random
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.metrics import instrument_engine
+from src.core.query_budget import enforce_query_budgets
+from src.db.pool import InstrumentedAsyncQueuePool
 
+# Blocking engine, kept for offline tooling (scripts, migrations, backfills)
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def _create_api_engine(url: str):
+    api_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    instrument_engine(api_engine.sync_engine)
+    enforce_query_budgets(api_engine.sync_engine)
+    return api_engine
+
+
+# Non-blocking engines used by the API
+async_engine = _create_api_engine(settings.async_database_url)
+replica_engines = [_create_api_engine(url) for url in settings.async_replica_urls]
+
+# user id -> True for users whose reads must stay on the primary for a while.
+# Per process: another worker only honours it if the load balancer is sticky.
+recent_writers = TTLCache(maxsize=100_000, ttl=settings.REPLICA_STICKY_SECONDS)
+
+
+class RoutingSession(Session):
+    """Sends reads to a replica when `info["use_replica"]` is set.
+
+    Writes, and every statement after the session's first write, go to the
+    primary so a request always sees what it wrote. So do statements carrying
+    the `use_primary` execution option: reads whose result fills a
+    process-wide cache, which a lagging replica would fill with stale rows.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        if (
+            replica_engines
+            and self.info.get("use_replica")
+            and not self.info.get("wrote")
+            and not _wants_primary(clause)
+        ):
+            return random.choice(replica_engines).sync_engine
+        return async_engine.sync_engine
+
+
+def _wants_primary(clause) -> bool:
+    return isinstance(clause, Executable) and clause.get_execution_options().get(
+        "use_primary", False
+    )
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id and session.info.get("wrote"):
+        recent_writers.set(user_id, True)
+
+
+def attach_user(session: Session | AsyncSession, user_id: str) -> None:
+    """Tie the session to `user_id`: route to the primary if they wrote recently."""
+    session.info["user_id"] = user_id
+    if recent_writers.get(user_id):
+        session.info["use_replica"] = False
+
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
 def get_db_session():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db_session(read_only: bool = False):
+    """`read_only` sessions may read from a replica; they still write to the primary."""
+    async with AsyncSessionLocal(info={"use_replica": read_only}) as db:
+        yield db
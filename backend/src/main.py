@@ -1,18 +1,32 @@
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from src.db.base_class import Base
-from src.db.session import engine
+from src.core.admission import AdmissionMiddleware, admission_gates
+from src.core.security import password_hash_pool, verified_token_cache
+from src.core.config import settings
+from src.core.dependencies import principal_cache
+from src.core.metrics import MetricsMiddleware, metrics_registry
+from src.db.migrations import check_schema
+from src.db.pool import pool_stats
+from src.db.session import async_engine, replica_engines
 from src.api.v1.router import api_router
 import src.models  # noqa: F401 — register all models with SQLAlchemy
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    # Schema changes are applied by `python -m src.db.migrate upgrade`, not at boot
+    if settings.SCHEMA_VERSION_CHECK:
+        await check_schema(async_engine)
     yield
+    password_hash_pool.shutdown()
+    for engine in (async_engine, *replica_engines):
+        await engine.dispose()
 
 
 app = FastAPI(
@@ -22,6 +36,13 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.ADMISSION_CONTROL:
+    # Inside CORS, so browsers can read the 503s it sends
+    app.add_middleware(
+        AdmissionMiddleware,
+        primary_pool=async_engine.pool,
+        replica_pools=[engine.pool for engine in replica_engines],
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -29,6 +50,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so its latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router)
 
@@ -36,3 +59,20 @@ app.include_router(api_router)
 @app.get("/")
 async def health_check():
     return {"status": "ok", "app": "InnerPlog"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body = metrics_registry.render(
+        {
+            "db_pool": pool_stats(async_engine.pool),
+            "password_hashing": password_hash_pool.stats(),
+            "principal_cache": principal_cache.stats(),
+            "token_cache": verified_token_cache.stats(),
+            **{
+                f"admission_{route_class}": gate.stats()
+                for route_class, gate in admission_gates.items()
+            },
+        }
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
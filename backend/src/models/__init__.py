@@ -1,5 +1,6 @@
 from src.models.user import User
 from src.models.post import Post
 from src.models.category import Category
+from src.models.tag_count import TagCount
 
-__all__ = ["User", "Post", "Category"]
+__all__ = ["User", "Post", "Category", "TagCount"]
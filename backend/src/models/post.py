@@ -1,28 +1,45 @@
 import uuid
 
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Table
-from sqlalchemy import Enum as SAEnum
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Text, DateTime, ForeignKey, Integer, Table
+from sqlalchemy import Enum as SAEnum, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from src.core.const import PostStatus
 from src.db.base_class import Base
 
+# Text search configuration baked into posts.search_vector
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+)
+
 post_categories = Table(
     "post_categories",
     Base.metadata,
     Column("post_id", UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
     Column("category_id", UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key leads with post_id; this one serves lookups by category
+    Index("ix_post_categories_category_id", "category_id", "post_id"),
 )
 
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_posts_tags", "tags", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
+    # Derived from content on write (see src/core/reading.py); NULL until backfilled
+    excerpt = Column(Text, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time_minutes = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -38,7 +55,38 @@ class Post(Base):
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
+    # Maintained by Postgres on every insert/update; title ranks above content
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        )
+    )
+
     author = relationship("User", back_populates="posts")
     categories = relationship(
         "Category", secondary=post_categories, back_populates="posts"
     )
+
+
+# Hot-path indexes matching PostDAO's filters and (created_at, id) ordering.
+# Built by migration 0004 (CREATE INDEX CONCURRENTLY).
+Index("ix_posts_created_at_id", Post.created_at.desc(), Post.id.desc())
+Index(
+    "ix_posts_author_created_at_id",
+    Post.author_id,
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
+Index(
+    "ix_posts_public_created_at_id",
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=Post.status == PostStatus.PUBLIC,
+)
+Index(
+    "ix_posts_status_created_at_id",
+    Post.status,
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.const import PostStatus
+from src.db.base_class import Base
+
+
+class TagCount(Base):
+    """Number of posts per (author, tag, status); maintained by a trigger on posts.
+
+    The table and the trigger are installed by migration 0003.
+    """
+
+    __tablename__ = "tag_counts"
+    __table_args__ = (Index("ix_tag_counts_status_tag", "status", "tag"),)
+
+    author_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tag = Column(String, primary_key=True)
+    status = Column(SAEnum(*PostStatus, name="post_status_enum"), primary_key=True)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# Recomputes the aggregate from scratch; run by `python -m src.db.rebuild_tag_counts`
+REBUILD_TAG_COUNTS = (
+    "DELETE FROM tag_counts",
+    """
+INSERT INTO tag_counts (author_id, tag, status, post_count)
+SELECT author_id, tag, status, count(*)
+FROM (SELECT DISTINCT id, author_id, status, unnest(tags) AS tag FROM posts) AS t
+GROUP BY author_id, tag, status
+""",
+)
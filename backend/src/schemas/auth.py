@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import BaseModel
 
 
@@ -8,3 +10,13 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: str | None = None
+
+
+class Principal(BaseModel):
+    """The slice of a user that authentication and authorization need."""
+
+    id: UUID
+    role: str
+    account_status: str
+
+    model_config = {"from_attributes": True}
@@ -2,9 +2,9 @@ import re
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
-from src.core.const import PostStatus
+from src.core.const import CountMode, PostStatus
 from src.schemas.category import CategoryResponse
 
 
@@ -48,6 +48,10 @@ class PostCreate(BaseModel):
         return v
 
 
+class PostImport(PostCreate):
+    created_at: datetime | None = None
+
+
 class PostUpdate(BaseModel):
     title: str | None = Field(default=None, max_length=300)
     content: str | None = None
@@ -109,6 +113,9 @@ class PostResponse(BaseModel):
     id: UUID
     title: str
     content: str
+    excerpt: str | None = None
+    word_count: int | None = None
+    reading_time_minutes: int | None = None
     created_at: datetime
     updated_at: datetime
     status: str
@@ -119,12 +126,87 @@ class PostResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_row(cls, row, categories: list | None = None) -> "PostResponse":
+        """Build from the RETURNING row of a PostDAO write; `categories` overrides its own."""
+        data = dict(row)
+        author = PostAuthorResponse(
+            id=data["author_id"],
+            username=data.pop("author_username"),
+            fullname=data.pop("author_fullname"),
+        )
+        category_ids = data.pop("category_ids", None) or []
+        category_names = data.pop("category_names", None) or []
+        if categories is None:
+            categories = [
+                CategoryResponse(id=category_id, name=name)
+                for category_id, name in zip(category_ids, category_names)
+            ]
+        return cls.model_validate(
+            {**data, "author": author, "categories": categories}, from_attributes=True
+        )
+
+
+class PostSummaryResponse(BaseModel):
+    """Sparse post: only the requested fields are set and serialized."""
+
+    id: UUID
+    title: str | None = None
+    content: str | None = None
+    excerpt: str | None = None
+    word_count: int | None = None
+    reading_time_minutes: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    status: str | None = None
+    tags: list[str] | None = None
+    author_id: UUID | None = None
+    author: PostAuthorResponse | None = None
+    categories: list[CategoryResponse] | None = None
+
+    model_config = {"from_attributes": True}
+
+    @classmethod
+    def from_post(cls, post, fields: set[str], **extra) -> "PostSummaryResponse":
+        data = {name: getattr(post, name) for name in fields | {"id"}}
+        return cls.model_validate({**data, **extra}, from_attributes=True)
+
+
+# Validates a page of ORM posts in one call instead of one model_validate per post
+post_list_adapter = TypeAdapter(list[PostResponse])
+
+POST_FIELDS = frozenset(PostSummaryResponse.model_fields)
+POST_SUMMARY_FIELDS = POST_FIELDS - {"content"}
+
 
 class PostListResponse(BaseModel):
-    items: list[PostResponse]
-    total: int
+    items: list[PostResponse] | list[PostSummaryResponse]
+    total: int | None
+    total_kind: CountMode = CountMode.EXACT
     page: int
     page_size: int
+    next_cursor: str | None = None
+
+
+class PostSearchHit(PostSummaryResponse):
+    rank: float
+    snippet: str
+
+
+class PostSearchResponse(BaseModel):
+    items: list[PostSearchHit]
+    next_cursor: str | None = None
+
+
+class PostImportError(BaseModel):
+    index: int
+    errors: list[str]
+
+
+class PostImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[PostImportError]
 
 
 class AdminPostUpdate(BaseModel):
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class TagCountResponse(BaseModel):
+    tag: str
+    count: int
+
+
+class TagFacetResponse(BaseModel):
+    items: list[TagCountResponse]
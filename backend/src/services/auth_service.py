@@ -1,41 +1,51 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.const import AccountStatus
-from src.core.security import hash_password, verify_password, create_access_token
+from src.core.security import (
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+)
 from src.dao.user_dao import UserDAO
+from src.db.errors import unique_violation
 from src.schemas.user import UserCreate
 
+# Unique index -> 400 detail; the insert itself is the availability check
+REGISTER_CONFLICTS = {
+    "ix_users_username": "Username already taken",
+    "ix_users_email": "Email already registered",
+}
+
 
 class AuthService:
     @staticmethod
-    def register(db: Session, payload: UserCreate):
-        if UserDAO.get_by_username(db, payload.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken",
+    async def register(db: AsyncSession, payload: UserCreate):
+        hashed_password = await hash_password_async(payload.password)
+        try:
+            user = await UserDAO.create(
+                db,
+                username=payload.username,
+                email=payload.email,
+                hashed_password=hashed_password,
+                fullname=payload.fullname,
+                dob=payload.dob,
+                description=payload.description,
             )
-        if UserDAO.get_by_email(db, payload.email):
+        except IntegrityError as exc:
+            detail = REGISTER_CONFLICTS.get(unique_violation(exc))
+            if detail is None:
+                raise
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
-
-        user = UserDAO.create(
-            db,
-            username=payload.username,
-            email=payload.email,
-            hashed_password=hash_password(payload.password),
-            fullname=payload.fullname,
-            dob=payload.dob,
-            description=payload.description,
-        )
+                status_code=status.HTTP_400_BAD_REQUEST, detail=detail
+            ) from None
         return user
 
     @staticmethod
-    def login(db: Session, username: str, password: str):
-        user = UserDAO.get_by_username(db, username)
-        if not user or not verify_password(password, user.hashed_password):
+    async def login(db: AsyncSession, username: str, password: str):
+        user = await UserDAO.get_by_username(db, username)
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
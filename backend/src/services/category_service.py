@@ -1,21 +1,43 @@
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import VersionedCache
+from src.core.config import settings
+from src.core.http import make_etag
 from src.dao.category_dao import CategoryDAO
 from src.dao.post_dao import PostDAO
-from src.schemas.category import CategoryCreate, CategoryUpdate
+from src.db.errors import unique_violation
+from src.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+
+# (serialized list, etag); bumped by every category write
+category_cache = VersionedCache(ttl=settings.CATEGORY_CACHE_TTL_SECONDS)
+category_list_adapter = TypeAdapter(list[CategoryResponse])
 
 
 class CategoryService:
     @staticmethod
-    def list_categories(db: Session):
-        return CategoryDAO.get_all(db)
+    async def list_categories_cached(db: AsyncSession) -> tuple[bytes, str]:
+        """Serialized category list and its strong ETag, from cache when current."""
+        cached = category_cache.get()
+        if cached is not None:
+            return cached
+
+        version = category_cache.version
+        categories = category_list_adapter.validate_python(
+            await CategoryDAO.get_all(db, primary=True), from_attributes=True
+        )
+        body = category_list_adapter.dump_json(categories)
+        cached = (body, make_etag(body))
+        category_cache.set(cached, version)
+        return cached
 
     @staticmethod
-    def get_category(db: Session, category_id: UUID):
-        category = CategoryDAO.get_by_id(db, category_id)
+    async def get_category(db: AsyncSession, category_id: UUID):
+        category = await CategoryDAO.get_by_id(db, category_id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
@@ -23,31 +45,38 @@ class CategoryService:
         return category
 
     @staticmethod
-    def create_category(db: Session, payload: CategoryCreate):
-        if CategoryDAO.get_by_name(db, payload.name):
+    async def create_category(db: AsyncSession, payload: CategoryCreate):
+        try:
+            category = await CategoryDAO.create(db, name=payload.name)
+        except IntegrityError as exc:
+            if unique_violation(exc) != "ix_categories_name":
+                raise
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Category name already exists",
-            )
-        return CategoryDAO.create(db, name=payload.name)
+            ) from None
+        category_cache.bump()
+        return category
 
     @staticmethod
-    def update_category(db: Session, category_id: UUID, payload: CategoryUpdate):
-        category = CategoryDAO.get_by_id(db, category_id)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
-            )
-
-        existing = CategoryDAO.get_by_name(db, payload.name)
-        if existing and existing.id != category.id:
+    async def update_category(
+        db: AsyncSession, category_id: UUID, payload: CategoryUpdate
+    ):
+        try:
+            renamed = await CategoryDAO.update(db, category_id, name=payload.name)
+        except IntegrityError as exc:
+            if unique_violation(exc) != "ix_categories_name":
+                raise
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Category name already exists",
+            ) from None
+        if not renamed:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
             )
-
-        post_count = PostDAO.count_by_category(db, category_id)
-        updated = CategoryDAO.update(db, category, name=payload.name)
+        updated, post_count = renamed
+        category_cache.bump()
 
         result = {
             "category": updated,
@@ -60,14 +89,14 @@ class CategoryService:
         return result
 
     @staticmethod
-    def delete_category(db: Session, category_id: UUID):
-        category = CategoryDAO.get_by_id(db, category_id)
+    async def delete_category(db: AsyncSession, category_id: UUID):
+        category = await CategoryDAO.get_by_id(db, category_id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
             )
 
-        post_count = PostDAO.count_by_category(db, category_id)
+        post_count = await PostDAO.count_by_category(db, category_id)
         if post_count > 0:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -75,4 +104,5 @@ class CategoryService:
                 "Remove the category from those posts first, or reassign them.",
             )
 
-        CategoryDAO.delete(db, category)
+        await CategoryDAO.delete(db, category)
+        category_cache.bump()
@@ -1,41 +1,123 @@
-from uuid import UUID
+from collections.abc import AsyncIterator
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.const import PostStatus
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.const import CountMode, PostStatus, PostView
+from src.core.pagination import decode_cursor, decode_rank_cursor
+from src.core.reading import content_stats
 from src.dao.post_dao import PostDAO
 from src.dao.category_dao import CategoryDAO
-from src.models.user import User
-from src.schemas.post import PostCreate, PostUpdate, AdminPostUpdate
+from src.schemas.auth import Principal
+from src.schemas.post import (
+    POST_FIELDS,
+    POST_SUMMARY_FIELDS,
+    PostCreate,
+    PostImport,
+    PostResponse,
+    PostSearchHit,
+    PostSummaryResponse,
+    PostUpdate,
+    AdminPostUpdate,
+    post_list_adapter,
+)
+
+post_count_cache = TTLCache(
+    maxsize=settings.POST_COUNT_CACHE_MAX_ENTRIES,
+    ttl=settings.POST_COUNT_CACHE_TTL_SECONDS,
+)
 
 
 class PostService:
     @staticmethod
-    def _resolve_categories(db: Session, category_ids: list[UUID]):
-        categories = []
-        for cid in category_ids:
-            cat = CategoryDAO.get_by_id(db, cid)
-            if not cat:
+    def _decode_cursor(cursor: str | None, decoder=decode_cursor):
+        if cursor is None:
+            return None
+        try:
+            return decoder(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    @staticmethod
+    def _select_fields(view: PostView, fields: str | None) -> set[str] | None:
+        """Resolve `view`/`fields` query params; None means the full post."""
+        if fields:
+            selected = {name.strip() for name in fields.split(",") if name.strip()}
+            unknown = selected - POST_FIELDS
+            if unknown:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Category {cid} not found",
+                    detail=f"Unknown field(s): {', '.join(sorted(unknown))}",
                 )
-            categories.append(cat)
-        return categories
+            return selected | {"id"}
+        if view == PostView.SUMMARY:
+            return set(POST_SUMMARY_FIELDS)
+        return None
+
+    @staticmethod
+    def _shape(posts: list, fields: set[str] | None):
+        if fields is None:
+            return post_list_adapter.validate_python(posts, from_attributes=True)
+        return [PostSummaryResponse.from_post(post, fields) for post in posts]
+
+    @staticmethod
+    async def _count_posts(
+        db: AsyncSession, filters: list, cache_key: tuple, include_total: bool
+    ):
+        mode = settings.POST_COUNT_MODE
+        if not include_total or mode == CountMode.NONE:
+            return None, CountMode.NONE
+        if mode == CountMode.ESTIMATED:
+            return await PostDAO.estimate_count(db, filters), mode
+        if mode == CountMode.CACHED:
+            total = post_count_cache.get(cache_key)
+            if total is None:
+                # A post write clearing the cache mid-count makes this total stale
+                generation = post_count_cache.generation
+                total = await PostDAO.count(db, filters, primary=True)
+                post_count_cache.set(cache_key, total, generation=generation)
+            return total, mode
+        return await PostDAO.count(db, filters), CountMode.EXACT
 
     @staticmethod
-    def list_posts(
-        db: Session,
-        current_user: User,
+    async def _resolve_categories(db: AsyncSession, category_ids: list[UUID]):
+        unique_ids = list(dict.fromkeys(category_ids))
+        by_id = {cat.id: cat for cat in await CategoryDAO.get_by_ids(db, unique_ids)}
+        missing = [str(cid) for cid in unique_ids if cid not in by_id]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Category {missing[0]} not found"
+                    if len(missing) == 1
+                    else f"Categories {', '.join(missing)} not found"
+                ),
+            )
+        return [by_id[cid] for cid in unique_ids]
+
+    @staticmethod
+    async def list_posts(
+        db: AsyncSession,
+        current_user: Principal,
         *,
         page: int = 1,
         page_size: int = 10,
         status_filter: str | None = None,
         tag: str | None = None,
         author_id: UUID | None = None,
+        cursor: str | None = None,
+        include_total: bool = True,
+        view: PostView = PostView.FULL,
+        fields: str | None = None,
     ):
-        posts, total = PostDAO.get_public_and_own(
+        selected = PostService._select_fields(view, fields)
+        posts, next_cursor = await PostDAO.get_public_and_own(
             db,
             current_user.id,
             page=page,
@@ -43,12 +125,85 @@ class PostService:
             status_filter=status_filter,
             tag_filter=tag,
             author_id=author_id,
+            cursor=PostService._decode_cursor(cursor),
+            fields=selected,
+        )
+        filters = PostDAO.visible_filters(
+            current_user.id,
+            status_filter=status_filter,
+            tag_filter=tag,
+            author_id=author_id,
         )
-        return posts, total
+        total, total_kind = await PostService._count_posts(
+            db,
+            filters,
+            ("feed", current_user.id, status_filter, tag, author_id),
+            include_total,
+        )
+        return {
+            "items": PostService._shape(posts, selected),
+            "total": total,
+            "total_kind": total_kind,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    async def search_posts(
+        db: AsyncSession,
+        current_user: Principal,
+        query_text: str,
+        *,
+        page_size: int = 10,
+        status_filter: str | None = None,
+        tag: str | None = None,
+        author_id: UUID | None = None,
+        cursor: str | None = None,
+    ):
+        fields = set(POST_SUMMARY_FIELDS)
+        hits, next_cursor = await PostDAO.search(
+            db,
+            PostDAO.visible_filters(
+                current_user.id,
+                status_filter=status_filter,
+                tag_filter=tag,
+                author_id=author_id,
+            ),
+            query_text,
+            page_size=page_size,
+            cursor=PostService._decode_cursor(cursor, decode_rank_cursor),
+            fields=fields,
+        )
+        return {
+            "items": [
+                PostSearchHit.from_post(post, fields, rank=rank, snippet=snippet)
+                for post, rank, snippet in hits
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    async def get_post_validators(
+        db: AsyncSession, post_id: UUID, current_user: Principal
+    ):
+        """Access-check a post and return its (etag, last_modified, is_public)."""
+        version = await PostDAO.get_version(db, post_id)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        author_id, post_status, updated_at = version
+        if post_status != PostStatus.PUBLIC and author_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have access to this post",
+            )
+        # Weak: embedded author/category names can change without touching the post
+        etag = f'W/"{post_id}-{updated_at.timestamp():.6f}"'
+        return etag, updated_at, post_status == PostStatus.PUBLIC
 
     @staticmethod
-    def get_post(db: Session, post_id: UUID, current_user: User):
-        post = PostDAO.get_by_id(db, post_id)
+    async def get_post(db: AsyncSession, post_id: UUID, current_user: Principal):
+        post = await PostDAO.get_by_id(db, post_id)
         if not post:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
@@ -61,53 +216,160 @@ class PostService:
         return post
 
     @staticmethod
-    def create_post(db: Session, current_user: User, payload: PostCreate):
-        categories = PostService._resolve_categories(db, payload.category_ids)
+    async def create_post(db: AsyncSession, current_user: Principal, payload: PostCreate):
+        categories = await PostService._resolve_categories(db, payload.category_ids)
 
-        post = PostDAO.create(
+        row = await PostDAO.create(
             db,
             title=payload.title,
             content=payload.content,
+            **content_stats(payload.content),
             status=payload.status,
             tags=payload.tags,
             author_id=current_user.id,
             categories=categories,
         )
-        return PostDAO.get_by_id(db, post.id)
+        post_count_cache.clear()
+        return PostResponse.from_row(row, categories)
 
     @staticmethod
-    def update_post(db: Session, post_id: UUID, current_user: User, payload: PostUpdate):
-        post = PostDAO.get_by_id(db, post_id)
-        if not post:
+    async def import_posts(
+        db: AsyncSession,
+        current_user: Principal,
+        records: AsyncIterator,
+        *,
+        batch_size: int,
+    ):
+        """Validate streamed records with the PostCreate rules and insert them in batches."""
+        imported = 0
+        errors = []
+        pending: list[tuple[int, PostImport]] = []
+
+        index = -1
+        try:
+            async for record in records:
+                index += 1
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    pending.append((index, PostImport.model_validate(record)))
+                except ValidationError as exc:
+                    errors.append(
+                        {
+                            "index": index,
+                            "errors": [
+                                f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                                for err in exc.errors()
+                            ],
+                        }
+                    )
+                except ValueError as exc:
+                    errors.append({"index": index, "errors": [str(exc)]})
+
+                if len(pending) >= batch_size:
+                    imported += await PostService._import_batch(
+                        db, current_user, pending, errors
+                    )
+                    pending = []
+        except ValueError as exc:
+            # Earlier batches are committed; say how many so the client can resume
+            if imported:
+                post_count_cache.clear()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": str(exc), "imported": imported},
             )
-        if post.author_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only edit your own posts",
+
+        if pending:
+            imported += await PostService._import_batch(db, current_user, pending, errors)
+        if imported:
+            post_count_cache.clear()
+        errors.sort(key=lambda error: error["index"])
+        return {"imported": imported, "failed": len(errors), "errors": errors}
+
+    @staticmethod
+    async def _import_batch(
+        db: AsyncSession,
+        current_user: Principal,
+        pending: list[tuple[int, PostImport]],
+        errors: list[dict],
+    ) -> int:
+        """Insert one batch of validated records; category ids resolve in one query."""
+        wanted = {cid for _, payload in pending for cid in payload.category_ids}
+        known = {cat.id for cat in await CategoryDAO.get_by_ids(db, list(wanted))}
+
+        posts: list[dict] = []
+        links: list[dict] = []
+        for index, payload in pending:
+            missing = [cid for cid in payload.category_ids if cid not in known]
+            if missing:
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": [f"Category {cid} not found" for cid in missing],
+                    }
+                )
+                continue
+
+            post = {
+                "id": uuid4(),
+                "title": payload.title,
+                "content": payload.content,
+                **content_stats(payload.content),
+                "status": payload.status,
+                "tags": payload.tags,
+                "author_id": current_user.id,
+            }
+            if payload.created_at is not None:
+                post["created_at"] = payload.created_at
+            posts.append(post)
+            links.extend(
+                {"post_id": post["id"], "category_id": cid}
+                for cid in dict.fromkeys(payload.category_ids)
             )
+
+        if posts:
+            await PostDAO.bulk_create(db, posts, links)
+        return len(posts)
+
+    @staticmethod
+    async def update_post(
+        db: AsyncSession, post_id: UUID, current_user: Principal, payload: PostUpdate
+    ):
         update_kwargs: dict = {}
         if payload.title is not None:
             update_kwargs["title"] = payload.title
         if payload.content is not None:
             update_kwargs["content"] = payload.content
+            update_kwargs.update(content_stats(payload.content))
         if payload.status is not None:
             update_kwargs["status"] = payload.status
         if payload.tags is not None:
             update_kwargs["tags"] = payload.tags
 
+        categories = None
         if payload.category_ids is not None:
-            update_kwargs["categories"] = PostService._resolve_categories(
-                db, payload.category_ids
-            )
+            categories = await PostService._resolve_categories(db, payload.category_ids)
 
-        post = PostDAO.update(db, post, **update_kwargs)
-        return PostDAO.get_by_id(db, post.id)
+        row = await PostDAO.update(
+            db, post_id, author_id=current_user.id, categories=categories, **update_kwargs
+        )
+        if row is None:
+            # The update matched nothing: tell a missing post from someone else's
+            if not await PostDAO.get_version(db, post_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only edit your own posts",
+            )
+        post_count_cache.clear()
+        return PostResponse.from_row(row, categories)
 
     @staticmethod
-    def delete_post(db: Session, post_id: UUID, current_user: User):
-        post = PostDAO.get_by_id(db, post_id)
+    async def delete_post(db: AsyncSession, post_id: UUID, current_user: Principal):
+        post = await PostDAO.get_by_id(db, post_id)
         if not post:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
@@ -117,27 +379,53 @@ class PostService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only delete your own posts",
             )
-        PostDAO.delete(db, post)
+        await PostDAO.delete(db, post)
+        post_count_cache.clear()
 
     # --- Admin operations ---
 
     @staticmethod
-    def admin_list_all_posts(
-        db: Session,
+    async def admin_list_all_posts(
+        db: AsyncSession,
         *,
         page: int = 1,
         page_size: int = 10,
         status_filter: str | None = None,
+        cursor: str | None = None,
+        include_total: bool = True,
+        view: PostView = PostView.FULL,
+        fields: str | None = None,
     ):
-        return PostDAO.get_all(
-            db, page=page, page_size=page_size, status_filter=status_filter
+        selected = PostService._select_fields(view, fields)
+        posts, next_cursor = await PostDAO.get_all(
+            db,
+            page=page,
+            page_size=page_size,
+            status_filter=status_filter,
+            cursor=PostService._decode_cursor(cursor),
+            fields=selected,
         )
+        total, total_kind = await PostService._count_posts(
+            db,
+            PostDAO.admin_filters(status_filter=status_filter),
+            ("admin", status_filter),
+            include_total,
+        )
+        return {
+            "items": PostService._shape(posts, selected),
+            "total": total,
+            "total_kind": total_kind,
+            "next_cursor": next_cursor,
+        }
 
     @staticmethod
-    def admin_update_post_status(db: Session, post_id: UUID, payload: AdminPostUpdate):
-        post = PostDAO.get_by_id(db, post_id)
-        if not post:
+    async def admin_update_post_status(
+        db: AsyncSession, post_id: UUID, payload: AdminPostUpdate
+    ):
+        row = await PostDAO.update(db, post_id, status=payload.status)
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
             )
-        return PostDAO.update(db, post, status=payload.status)
+        post_count_cache.clear()
+        return PostResponse.from_row(row)
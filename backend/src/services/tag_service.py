@@ -0,0 +1,41 @@
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.dao.tag_dao import TagDAO
+from src.schemas.auth import Principal
+
+# Largest `limit` the tags endpoint accepts; the cached facet is cut from this
+MAX_FACET_SIZE = 200
+
+# The site-wide facet sums every author's rows, so it is shared by all callers
+tag_facet_cache = TTLCache(maxsize=1, ttl=settings.TAG_FACET_CACHE_TTL_SECONDS)
+
+
+class TagService:
+    @staticmethod
+    async def list_tag_counts(
+        db: AsyncSession,
+        current_user: Principal,
+        *,
+        author_id: UUID | None = None,
+        limit: int = 50,
+    ):
+        # The site-wide facet counts public posts only; an author's facet also
+        # counts their drafts when they ask for their own
+        if author_id is None:
+            counts = tag_facet_cache.get("public")
+            if counts is None:
+                counts = await TagDAO.get_counts(db, limit=MAX_FACET_SIZE, primary=True)
+                tag_facet_cache.set("public", counts)
+            counts = counts[:limit]
+        else:
+            counts = await TagDAO.get_counts(
+                db,
+                author_id=author_id,
+                include_private=author_id == current_user.id,
+                limit=limit,
+            )
+        return [{"tag": tag, "count": count} for tag, count in counts]
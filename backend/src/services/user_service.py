@@ -1,48 +1,104 @@
+import json
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.dependencies import principal_cache
+from src.dao.post_dao import PostDAO
 from src.dao.user_dao import UserDAO
+from src.db.errors import unique_violation
+from src.schemas.auth import Principal
 from src.schemas.user import UserUpdate, AdminUserUpdate
 
 
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
 class UserService:
     @staticmethod
-    def get_current_user_profile(db: Session, user):
+    async def get_current_user_profile(db: AsyncSession, principal: Principal):
+        user = await UserDAO.get_by_id(db, principal.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
         return user
 
     @staticmethod
-    def update_profile(db: Session, user, payload: UserUpdate):
-        if payload.email and payload.email != user.email:
-            existing = UserDAO.get_by_email(db, payload.email)
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already in use",
-                )
-
-        return UserDAO.update(
-            db,
-            user,
-            fullname=payload.fullname,
-            dob=payload.dob,
-            description=payload.description,
-            email=payload.email,
-        )
+    async def update_profile(
+        db: AsyncSession, principal: Principal, payload: UserUpdate
+    ):
+        try:
+            user = await UserDAO.update(
+                db,
+                principal.id,
+                fullname=payload.fullname,
+                dob=payload.dob,
+                description=payload.description,
+                email=payload.email,
+            )
+        except IntegrityError as exc:
+            if unique_violation(exc) != "ix_users_email":
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already in use",
+            ) from None
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        principal_cache.delete(str(user.id))
+        return user
 
     @staticmethod
-    def admin_get_all_users(db: Session, skip: int = 0, limit: int = 50):
-        return UserDAO.get_all(db, skip=skip, limit=limit)
+    async def export_posts(
+        db: AsyncSession, principal: Principal, *, compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Stream the user's posts as NDJSON, optionally gzipped, in ~64 KiB chunks."""
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        buffer = bytearray()
+        async for row in PostDAO.stream_by_author(db, principal.id):
+            record = dict(row)
+            record["category_ids"] = record["category_ids"] or []
+            record["categories"] = record["categories"] or []
+            buffer += json.dumps(record, default=_json_default).encode()
+            buffer += b"\n"
+            if len(buffer) >= EXPORT_CHUNK_BYTES:
+                chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+                buffer.clear()
+                if chunk:
+                    yield chunk
+
+        tail = bytes(buffer)
+        if compressor:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def admin_get_all_users(db: AsyncSession, skip: int = 0, limit: int = 50):
+        return await UserDAO.get_all(db, skip=skip, limit=limit)
 
     @staticmethod
-    def admin_update_user_status(
-        db: Session, user_id: UUID, payload: AdminUserUpdate
+    async def admin_update_user_status(
+        db: AsyncSession, user_id: UUID, payload: AdminUserUpdate
     ):
-        user = UserDAO.get_by_id(db, user_id)
+        user = await UserDAO.update(db, user_id, account_status=payload.account_status)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
-
-        return UserDAO.update(db, user, account_status=payload.account_status)
+        principal_cache.delete(str(user.id))
+        return user
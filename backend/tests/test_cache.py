@@ -0,0 +1,20 @@
+from src.core.cache import TTLCache, VersionedCache
+
+
+def test_ttl_cache_drops_values_loaded_before_a_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.clear()  # a write lands while the value is being loaded
+    cache.set("total", 41, generation=generation)
+    assert cache.get("total") is None
+
+    cache.set("total", 42, generation=cache.generation)
+    assert cache.get("total") == 42
+
+
+def test_versioned_cache_drops_values_loaded_before_a_bump():
+    cache = VersionedCache(ttl=60)
+    version = cache.version
+    cache.bump()
+    cache.set("stale", version)
+    assert cache.get() is None
@@ -0,0 +1,21 @@
+from src.db.pool import InstrumentedAsyncQueuePool, pool_saturated, pool_stats
+
+
+def busy_pool(max_overflow: int, checked_out: int, waiting: int) -> InstrumentedAsyncQueuePool:
+    pool = InstrumentedAsyncQueuePool(lambda: None, pool_size=2, max_overflow=max_overflow)
+    pool.checkedout = lambda: checked_out
+    pool.metrics.waiting = waiting
+    return pool
+
+
+def test_saturated_once_size_plus_overflow_is_out_and_callers_queue():
+    assert not pool_saturated(busy_pool(1, checked_out=2, waiting=5), max_waiting=3)
+    assert not pool_saturated(busy_pool(1, checked_out=3, waiting=2), max_waiting=3)
+    assert pool_saturated(busy_pool(1, checked_out=3, waiting=3), max_waiting=3)
+    assert pool_saturated(busy_pool(0, checked_out=2, waiting=3), max_waiting=3)
+
+
+def test_unlimited_overflow_is_never_saturated():
+    pool = busy_pool(-1, checked_out=50, waiting=10)
+    assert not pool_saturated(pool, max_waiting=3)
+    assert pool_stats(pool)["max_overflow"] == -1
@@ -0,0 +1,182 @@
+"""Every /api/v1 route declares a query budget and stays within it."""
+
+from contextlib import nullcontext
+
+import pytest
+from fastapi.routing import APIRoute
+
+from src.core.dependencies import principal_cache
+from src.core.query_budget import assert_max_queries, declared_budget, routes_without_budget
+from src.main import app
+
+API_ROUTES = [
+    route
+    for route in app.routes
+    if isinstance(route, APIRoute) and route.path.startswith("/api/v1")
+]
+
+
+def call(client, method: str, path: str, *, path_params: dict | None = None, **kwargs):
+    """Send a request to the route declared as `method path`, within its budget.
+
+    The principal cache is cleared first, so the budget has to cover the
+    lookup get_current_user makes on a miss. Unbounded routes are only sent.
+    """
+    route = next(r for r in API_ROUTES if r.path == path and method in r.methods)
+    budget = declared_budget(route)
+    principal_cache.clear()
+    with assert_max_queries(budget) if budget is not None else nullcontext():
+        return client.request(method, path.format(**(path_params or {})), **kwargs)
+
+
+def test_every_api_route_declares_a_budget():
+    assert API_ROUTES
+    assert routes_without_budget(API_ROUTES) == []
+
+
+def test_unauthenticated_routes(client):
+    assert call(client, "GET", "/api/v1/categories").status_code == 200
+
+
+def test_post_routes(client, writer):
+    headers = writer["headers"]
+    created = call(
+        client,
+        "POST",
+        "/api/v1/posts",
+        headers=headers,
+        json={"title": "Budgets", "content": "Counting queries", "tags": ["sql"]},
+    )
+    assert created.status_code == 201, created.text
+    post = {"post_id": created.json()["id"]}
+
+    for path, query in [
+        ("/api/v1/posts", {}),
+        ("/api/v1/posts", {"view": "summary", "tag": "sql"}),
+        ("/api/v1/posts/search", {"q": "counting"}),
+        ("/api/v1/tags", {}),
+        ("/api/v1/tags", {"author_id": writer["id"]}),
+    ]:
+        response = call(client, "GET", path, headers=headers, params=query)
+        assert response.status_code == 200, response.text
+
+    response = call(
+        client, "GET", "/api/v1/posts/{post_id}", path_params=post, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    response = call(
+        client,
+        "PUT",
+        "/api/v1/posts/{post_id}",
+        path_params=post,
+        headers=headers,
+        json={"title": "Budgets, again", "tags": ["sql", "orm"]},
+    )
+    assert response.status_code == 200, response.text
+    response = call(
+        client, "DELETE", "/api/v1/posts/{post_id}", path_params=post, headers=headers
+    )
+    assert response.status_code == 204, response.text
+
+    response = call(
+        client,
+        "POST",
+        "/api/v1/posts/import",
+        headers=headers | {"Content-Type": "application/x-ndjson"},
+        content=b'{"title": "One", "content": "a"}\n{"title": "Two", "content": "b"}\n',
+    )
+    assert response.json()["imported"] == 2, response.text
+
+
+def test_user_routes(client, writer):
+    headers = writer["headers"]
+    assert call(client, "GET", "/api/v1/users/me", headers=headers).status_code == 200
+    response = call(
+        client, "PUT", "/api/v1/users/me", headers=headers, json={"fullname": "Query Counter"}
+    )
+    assert response.status_code == 200, response.text
+    response = call(client, "GET", "/api/v1/users/me/export", headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def test_admin_routes(client, admin, writer):
+    headers = admin["headers"]
+    created = call(
+        client,
+        "POST",
+        "/api/v1/posts",
+        headers=writer["headers"],
+        json={"title": "Moderated", "content": "Body", "status": "public"},
+    )
+    post = {"post_id": created.json()["id"]}
+
+    for path in [
+        "/api/v1/admin/users",
+        "/api/v1/admin/posts",
+        "/api/v1/admin/categories",
+        "/api/v1/admin/stats/password-hashing",
+        "/api/v1/admin/stats/principal-cache",
+        "/api/v1/admin/stats/token-cache",
+        "/api/v1/admin/stats/db-pool",
+        "/api/v1/admin/stats/admission",
+    ]:
+        response = call(client, "GET", path, headers=headers)
+        assert response.status_code == 200, (path, response.text)
+
+    response = call(
+        client,
+        "PATCH",
+        "/api/v1/admin/posts/{post_id}/status",
+        path_params=post,
+        headers=headers,
+        json={"status": "banned"},
+    )
+    assert response.status_code == 200, response.text
+    response = call(
+        client,
+        "PATCH",
+        "/api/v1/admin/users/{user_id}/status",
+        path_params={"user_id": writer["id"]},
+        headers=headers,
+        json={"account_status": "banned"},
+    )
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("in_use", [False, True])
+def test_category_routes(client, admin, writer, in_use):
+    headers = admin["headers"]
+    created = call(
+        client,
+        "POST",
+        "/api/v1/admin/categories",
+        headers=headers,
+        json={"name": f"Budgeted {in_use} {admin['username']}"},
+    )
+    assert created.status_code == 201, created.text
+    category = {"category_id": created.json()["id"]}
+    if in_use:
+        client.post(
+            "/api/v1/posts",
+            headers=writer["headers"],
+            json={"title": "Filed", "content": "Body", "category_ids": [category["category_id"]]},
+        )
+
+    response = call(
+        client,
+        "PUT",
+        "/api/v1/admin/categories/{category_id}",
+        path_params=category,
+        headers=headers,
+        json={"name": f"Renamed {created.json()['name']}"},
+    )
+    assert response.status_code == 200, response.text
+    response = call(
+        client,
+        "DELETE",
+        "/api/v1/admin/categories/{category_id}",
+        path_params=category,
+        headers=headers,
+    )
+    # A category still in use is refused, after the same checks
+    assert response.status_code == (409 if in_use else 204), response.text
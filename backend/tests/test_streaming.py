@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.config import settings
+from src.core.streaming import iter_json_array, iter_ndjson
+
+RECORDS = [
+    {"title": "Plain", "content": "text", "tags": ["a", "b"]},
+    {"title": "Escapes \" \\\\ \\u00e9", "content": "line\nbreak", "tags": []},
+    {"title": "Numbers", "count": -12.5e3, "ok": True, "none": None},
+    12345,
+    "ünïcödé ✓",
+]
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def parse(parser, body: bytes, chunk_size: int, max_record_size: int = 1000) -> list:
+    async def collect():
+        return [value async for value in parser(_chunks(body, chunk_size), max_record_size)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 20))
+def test_json_array_any_chunking(chunk_size):
+    body = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode()
+    assert parse(iter_json_array, body, chunk_size) == RECORDS
+    assert parse(iter_json_array, b" [ ] ", chunk_size) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_ndjson_any_chunking(chunk_size):
+    body = "\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS).encode()
+    assert parse(iter_ndjson, body + b"\n\n", chunk_size) == RECORDS
+    assert parse(iter_ndjson, body, chunk_size) == RECORDS
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b'{"a": 1}', "must be a JSON array"),
+        (b"[1, 2", "Unterminated JSON array"),
+        (b"[1 2]", "Expected ',' or ']' after element 0"),
+        (b"[1, tru]", "Malformed JSON at element 1"),
+        (b"[1] [2]", "Unexpected data after the JSON array"),
+    ],
+)
+def test_json_array_rejects_malformed_bodies(body, message):
+    for chunk_size in (1, 3, len(body)):
+        with pytest.raises(ValueError, match=message):
+            parse(iter_json_array, body, chunk_size)
+
+
+def test_oversized_records_end_the_import():
+    big = json.dumps({"content": "x" * 2000}).encode()
+    for chunk_size in (1, 100, 10_000):
+        with pytest.raises(ValueError, match="Element 1 is longer than 1000 characters"):
+            parse(iter_json_array, b"[1, " + big + b"]", chunk_size)
+        with pytest.raises(ValueError, match="Line 2 is longer than 1000 characters"):
+            parse(iter_ndjson, b"1\n" + big + b"\n", chunk_size)
+    # Without a closing brace or newline, the buffer stops at the limit too
+    with pytest.raises(ValueError, match="Element 0"):
+        parse(iter_json_array, b'[{"content": "' + b"x" * 5000, 64)
+    with pytest.raises(ValueError, match="Line 1"):
+        parse(iter_ndjson, b"x" * 5000, 64)
+
+
+def test_bad_ndjson_line_is_reported_in_place():
+    values = parse(iter_ndjson, b'{"a": 1}\n{bad\n{"b": 2}\n', 5)
+    assert values[0] == {"a": 1} and values[2] == {"b": 2}
+    assert isinstance(values[1], ValueError)
+
+
+def test_import_stops_at_an_oversized_record(client, writer, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_CHARS", 200)
+    small = json.dumps({"title": "Kept", "content": "body"})
+    big = json.dumps({"title": "Dropped", "content": "x" * 500})
+    response = client.post(
+        "/api/v1/posts/import?batch_size=1",
+        headers=writer["headers"] | {"Content-Type": "application/x-ndjson"},
+        content=f"{small}\n{big}\n{small}\n".encode(),
+    )
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == {
+        "message": "Line 2 is longer than 200 characters",
+        "imported": 1,
+    }
@@ -0,0 +1,173 @@
+"""Writes run as single INSERT/UPDATE ... RETURNING statements.
+
+Counts are exact, so an extra pre-check or reload shows up here even when
+the route's query budget would still allow it. The principal cache is
+warmed first, so only the write path itself is counted.
+"""
+
+import uuid
+
+import pytest
+
+from src.core.query_budget import count_queries
+
+from conftest import PASSWORD, register
+
+
+def unique_name(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:12]}"
+
+
+def create_category(client, admin) -> dict:
+    response = client.post(
+        "/api/v1/admin/categories", headers=admin["headers"], json={"name": unique_name("cat")}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def warm(client, user):
+    assert client.get("/api/v1/users/me", headers=user["headers"]).status_code == 200
+
+
+def test_register_is_one_insert(client):
+    username = unique_name("reg")
+    with count_queries() as log:
+        response = client.post(
+            "/api/v1/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": PASSWORD},
+        )
+    assert response.status_code == 201, response.text
+    assert log.count == 1, log.statements
+    assert log.statements[0].startswith("INSERT INTO users")
+
+
+def test_duplicate_registration_is_reported_from_the_unique_index(client, writer):
+    taken_username = {
+        "username": writer["username"],
+        "email": f"{unique_name('other')}@example.com",
+        "password": PASSWORD,
+    }
+    taken_email = {
+        "username": unique_name("other"),
+        "email": writer["email"],
+        "password": PASSWORD,
+    }
+
+    for payload, detail in [
+        (taken_username, "Username already taken"),
+        (taken_email, "Email already registered"),
+    ]:
+        with count_queries() as log:
+            response = client.post("/api/v1/auth/register", json=payload)
+        assert response.status_code == 400, response.text
+        assert response.json() == {"detail": detail}
+        assert log.count == 1, log.statements
+
+
+def test_profile_email_in_use(client, writer):
+    other = register(client)
+    warm(client, other)
+    with count_queries() as log:
+        response = client.put(
+            "/api/v1/users/me", headers=other["headers"], json={"email": writer["email"]}
+        )
+    assert response.status_code == 400, response.text
+    assert response.json() == {"detail": "Email already in use"}
+    assert log.count == 1, log.statements
+
+
+def test_create_post_resolves_categories_then_inserts(client, admin, writer):
+    category = create_category(client, admin)
+    warm(client, writer)
+    with count_queries() as log:
+        response = client.post(
+            "/api/v1/posts",
+            headers=writer["headers"],
+            json={"title": "One trip", "content": "Body", "category_ids": [category["id"]]},
+        )
+    assert response.status_code == 201, response.text
+    assert response.json()["categories"] == [category]
+    assert response.json()["author"]["username"] == writer["username"]
+    # SELECT categories, INSERT posts ... RETURNING (links in a CTE)
+    assert log.count == 2, log.statements
+
+
+# Compiling the link CTEs must not warn about a cartesian product
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_update_post(client, admin, writer):
+    first, second = create_category(client, admin), create_category(client, admin)
+    created = client.post(
+        "/api/v1/posts",
+        headers=writer["headers"],
+        json={"title": "Draft", "content": "Body", "category_ids": [first["id"]]},
+    ).json()
+    path = f"/api/v1/posts/{created['id']}"
+    warm(client, writer)
+
+    with count_queries() as log:
+        response = client.put(path, headers=writer["headers"], json={"title": "Renamed"})
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["categories"] == [first]
+    assert log.count == 1, log.statements
+
+    with count_queries() as log:
+        response = client.put(
+            path, headers=writer["headers"], json={"category_ids": [second["id"]]}
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["categories"] == [second]
+    assert log.count == 2, log.statements
+
+    # Someone else's post: the UPDATE matches nothing, one lookup tells 403 from 404
+    other = register(client)
+    warm(client, other)
+    with count_queries() as log:
+        response = client.put(path, headers=other["headers"], json={"title": "Hijacked"})
+    assert response.status_code == 403, response.text
+    assert log.count == 2, log.statements
+    with count_queries() as log:
+        response = client.put(
+            f"/api/v1/posts/{uuid.uuid4()}", headers=other["headers"], json={"title": "Missing"}
+        )
+    assert response.status_code == 404, response.text
+    assert log.count == 2, log.statements
+
+
+def test_category_writes(client, admin):
+    warm(client, admin)
+    name = unique_name("cat")
+    with count_queries() as log:
+        response = client.post(
+            "/api/v1/admin/categories", headers=admin["headers"], json={"name": name}
+        )
+    assert response.status_code == 201, response.text
+    assert log.count == 1, log.statements
+    category = response.json()
+
+    with count_queries() as log:
+        response = client.put(
+            f"/api/v1/admin/categories/{category['id']}",
+            headers=admin["headers"],
+            json={"name": f"{name}_renamed"},
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["category"]["name"] == f"{name}_renamed"
+    assert log.count == 1, log.statements
+
+
+def test_duplicate_category_name_is_reported_from_the_unique_index(client, admin):
+    existing, other = create_category(client, admin), create_category(client, admin)
+    warm(client, admin)
+    for method, path in [
+        ("POST", "/api/v1/admin/categories"),
+        ("PUT", f"/api/v1/admin/categories/{other['id']}"),
+    ]:
+        with count_queries() as log:
+            response = client.request(
+                method, path, headers=admin["headers"], json={"name": existing["name"]}
+            )
+        assert response.status_code == 400, response.text
+        assert response.json() == {"detail": "Category name already exists"}
+        assert log.count == 1, log.statements